@@ -0,0 +1,154 @@
+import hashlib
+from collections import OrderedDict
+
+import numpy as np
+from manim import (
+    DOWN, LEFT, MED_SMALL_BUFF, ORIGIN, RIGHT, UP, WHITE, VGroup, VMobject,
+)
+from scipy import sparse
+
+from lecture_graph import GlyphBundle
+from text_cache import CachedText
+
+# Adjacency matrix, adjacency list and edge list views generated from one
+# adjacency array (dense or scipy.sparse). A matrix has only a handful of
+# distinct cell values, so each one is laid out once: small matrices get a
+# positioned copy per cell, large ones stamp every cell into one
+# GlyphBundle, which keeps a 200x200 matrix at two text layouts. Built
+# matrices are memoized on their contents and handed out as copies.
+#
+#   view = AdjacencyView(graph.adjacency(sparse=True), edges=graph.edges)
+#   matrix, adj_list = view.build_matrix(), view.build_adjacency_list()
+
+MAX_VIEWS = 32
+BUNDLE_CELLS = 100
+
+_matrices = OrderedDict()
+
+
+def cell_text(value):
+    return f"{value:g}"
+
+
+def _bracket(height, lip, stroke_width, color):
+    # "[" for a positive lip, "]" for a negative one
+    top, bottom = UP * height / 2, DOWN * height / 2
+    bracket = VMobject(stroke_width=stroke_width, stroke_color=color)
+    bracket.set_points_as_corners(
+        [top + RIGHT * lip, top, bottom, bottom + RIGHT * lip]
+    )
+    return bracket
+
+
+class AdjacencyView:
+    def __init__(self, matrix, labels=None, edges=None):
+        # ``edges`` keeps the edge list in its authored order and direction
+        self.edges = None if edges is None else [
+            (int(u), int(v)) for u, v in np.asarray(edges)[:, :2]
+        ]
+        self.matrix = sparse.csr_array(matrix)
+        self.matrix.eliminate_zeros()
+        self.matrix.sort_indices()
+        n = self.matrix.shape[0]
+        self.labels = [str(label) for label in (labels or range(1, n + 1))]
+        self.directed = (self.matrix != self.matrix.T).nnz > 0
+
+    @property
+    def num_vertices(self):
+        return self.matrix.shape[0]
+
+    def _digest(self):
+        digest = hashlib.sha256()
+        for array in (self.matrix.data, self.matrix.indices, self.matrix.indptr):
+            digest.update(np.ascontiguousarray(array).tobytes())
+        digest.update(repr(self.matrix.shape).encode())
+        return digest.hexdigest()
+
+    def neighbours(self, vertex):
+        start, end = self.matrix.indptr[vertex], self.matrix.indptr[vertex + 1]
+        return self.matrix.indices[start:end]
+
+    def adjacency_lines(self):
+        return [
+            f"{label}: [{', '.join(self.labels[v] for v in self.neighbours(u))}]"
+            for u, label in enumerate(self.labels)
+        ]
+
+    def edge_pairs(self):
+        # Without authored edges, each undirected edge once from its
+        # lower-numbered endpoint
+        if self.edges is not None:
+            return list(self.edges)
+        coo = (self.matrix if self.directed else sparse.triu(self.matrix)).tocoo()
+        order = np.lexsort((coo.col, coo.row))
+        return list(zip(coo.row[order].tolist(), coo.col[order].tolist()))
+
+    def edge_list_lines(self, per_line=8):
+        pairs = [f"({self.labels[u]},{self.labels[v]})" for u, v in self.edge_pairs()]
+        lines = [
+            ", ".join(pairs[i:i + per_line])
+            for i in range(0, len(pairs), per_line)
+        ] or [""]
+        lines[0] = "[" + lines[0]
+        lines[-1] += "]"
+        return lines
+
+    def build_matrix(self, font_size=48, v_buff=0.8, h_buff=1.3,
+                     bracket_buff=MED_SMALL_BUFF, color=WHITE):
+        key = (self._digest(), font_size, v_buff, h_buff, bracket_buff, str(color))
+        if key in _matrices:
+            _matrices.move_to_end(key)
+        else:
+            _matrices[key] = self._layout_matrix(
+                font_size, v_buff, h_buff, bracket_buff, color
+            )
+            if len(_matrices) > MAX_VIEWS:
+                _matrices.popitem(last=False)
+        return _matrices[key].copy()
+
+    def _layout_matrix(self, font_size, v_buff, h_buff, bracket_buff, color):
+        n = self.num_vertices
+        rows, cols = np.divmod(np.arange(n * n), n)
+        anchors = np.zeros((n * n, 3))
+        anchors[:, 0] = (cols - (n - 1) / 2) * h_buff
+        anchors[:, 1] = ((n - 1) / 2 - rows) * v_buff
+        texts = [cell_text(value) for value in self.matrix.toarray().ravel().tolist()]
+
+        if n * n > BUNDLE_CELLS:
+            entries = GlyphBundle(
+                texts, anchors, font_size=font_size, buff=0,
+                color=color, direction=ORIGIN,
+            )
+        else:
+            entries = VGroup(*[
+                VGroup(*[
+                    CachedText(texts[i], font_size=font_size, color=color)
+                    .move_to(anchors[i])
+                    for i in range(row * n, (row + 1) * n)
+                ])
+                for row in range(n)
+            ])
+
+        height = entries.height + 2 * bracket_buff
+        lip = min(h_buff, height) * 0.15
+        stroke_width = 2 * font_size / 48
+        left = _bracket(height, lip, stroke_width, color)
+        right = _bracket(height, -lip, stroke_width, color)
+        left.move_to(entries.get_left() + LEFT * bracket_buff, aligned_edge=RIGHT)
+        right.move_to(entries.get_right() + RIGHT * bracket_buff, aligned_edge=LEFT)
+        return VGroup(entries, left, right)
+
+    def build_adjacency_list(self, font_size=24, max_lines=None):
+        return self._build_lines(self.adjacency_lines(), font_size, max_lines)
+
+    def build_edge_list(self, font_size=24, per_line=8, max_lines=None):
+        return self._build_lines(
+            self.edge_list_lines(per_line), font_size, max_lines
+        )
+
+    def _build_lines(self, lines, font_size, max_lines):
+        if max_lines is not None and len(lines) > max_lines:
+            lines = lines[:max_lines - 1] + ["..."]
+        return VGroup(*[
+            CachedText(line, font_size=font_size) for line in lines
+        ]).arrange(DOWN, aligned_edge=LEFT)
@@ -0,0 +1,133 @@
+import argparse
+import json
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from manim.constants import QUALITIES
+
+import graph_theory_presentation as deck
+import render_farm
+from parametric_scene import ParametricScene
+from partial_store import prune_store
+from text_cache import prune_text_cache
+
+# Batch rendering of parametric scene variants. A JSON manifest lists one
+# job per course variant: the scene, a name, and the parameters it
+# replaces. Jobs run on a process pool whose workers live for the whole
+# batch, so text layouts stay in each worker's text cache, and every
+# animation that is identical across variants (same strings, same graph)
+# comes out of the shared partial movie store instead of being rendered
+# again:
+#
+#   python batch_render.py courses.json -j 16
+#
+#   {
+#     "quality": "high_quality",
+#     "jobs": [
+#       {"name": "cs101_es", "scene": "GraphTypes",
+#        "params": {"title": "Tipos de grafos", "vertex_color": "#FC6255"}},
+#       {"name": "cs240", "scene": "ShortestPathAlgorithms",
+#        "params": {"road_positions": [[-4, 0], [0, 2], [4, 0]],
+#                   "road_weights": [[0, 1, 3], [1, 2, 5]], "target": 2}}
+#     ]
+#   }
+
+
+def load_manifest(path):
+    with Path(path).open(encoding="utf-8") as fp:
+        manifest = json.load(fp)
+    jobs = manifest["jobs"]
+    names = [job["name"] for job in jobs]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ValueError(f"{path}: duplicate job names {duplicates}")
+    for job in jobs:
+        variant_class(job)
+    return manifest
+
+
+def variant_class(job):
+    scene_cls = getattr(deck, job["scene"], None)
+    if not (isinstance(scene_cls, type) and issubclass(scene_cls, ParametricScene)):
+        raise ValueError(f"{job['name']}: {job['scene']} is not a parametric scene")
+    return scene_cls.variant(job["name"], **job.get("params", {}))
+
+
+def render_job(job, quality, lod=False):
+    # (name, movie file or None, error or None); one failed variant does
+    # not stop the batch
+    start = time.perf_counter()
+    try:
+        movie = render_farm.render_section(
+            variant_class(job), job.get("quality", quality), lod=lod
+        )
+        return job["name"], movie, None, time.perf_counter() - start
+    except Exception:
+        return job["name"], None, traceback.format_exc(), time.perf_counter() - start
+
+
+def render_batch(manifest, jobs=None, quality=None, lod=False):
+    quality = quality or manifest.get("quality", "low_quality")
+    lod = lod or manifest.get("lod", False)
+    # Variants of the same scene next to each other share the most
+    pending = sorted(manifest["jobs"], key=lambda job: job["scene"])
+    results = {}
+    workers = min(jobs or os.cpu_count() or 1, len(pending)) or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(render_job, job, quality, lod) for job in pending
+        ]
+        for future in as_completed(futures):
+            name, movie, error, seconds = future.result()
+            results[name] = (movie, error)
+            status = movie if error is None else "FAILED"
+            print(f"[{len(results)}/{len(pending)}] {name} {seconds:.1f}s: {status}",
+                  flush=True)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Render parametric scene variants listed in a manifest"
+    )
+    parser.add_argument("manifest")
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=None,
+        help="worker processes (defaults to one per core)"
+    )
+    parser.add_argument(
+        "-q", "--quality", choices=sorted(QUALITIES),
+        help="overrides the manifest's quality"
+    )
+    parser.add_argument(
+        "--lod", action="store_true", help="render with the LOD camera"
+    )
+    parser.add_argument(
+        "--store-size", type=int, default=4096,
+        help="shared partial movie store budget in MiB"
+    )
+    parser.add_argument(
+        "--text-cache-size", type=int, default=256,
+        help="laid-out text cache budget in MiB"
+    )
+    args = parser.parse_args()
+
+    manifest = load_manifest(args.manifest)
+    start = time.perf_counter()
+    results = render_batch(manifest, args.jobs, args.quality, args.lod)
+    failed = {name: error for name, (_, error) in results.items() if error}
+    removed = prune_store(args.store_size * 1024**2)
+    prune_text_cache(args.text_cache_size * 1024**2, render_farm.MODULE_DIR / "media")
+    for name, error in failed.items():
+        print(f"\n{name} failed:\n{error}", file=sys.stderr)
+    print(f"{len(results) - len(failed)}/{len(results)} variants rendered "
+          f"in {time.perf_counter() - start:.0f}s, {removed} stored partials pruned")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,289 @@
+import argparse
+import inspect
+import json
+import resource
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+from manim import Create, Scene, tempconfig
+from manim.camera.camera import Camera
+from manim.constants import QUALITIES
+from manim.renderer.cairo_renderer import CairoRenderer
+from manim.scene.scene_file_writer import SceneFileWriter
+
+import graph_theory_presentation as deck
+from lecture_graph import LectureGraph
+from render_farm import MODULE_DIR, render_config
+from text_cache import text_cache_stats
+
+# Render benchmarks. Every scene is rendered in a fresh process (so peak RSS
+# and the in-memory text cache belong to that scene alone) and timed per
+# phase: mobject construction, text layout, rasterization and encoding.
+# Encoding runs on manim's writer thread alongside rasterization, so the
+# phases can add up to more than the wall time. Each run is appended to a
+# JSON-lines history, and a scene whose wall time exceeds the median of its
+# recent runs by more than the threshold fails the run:
+#
+#   python benchmark.py -q low_quality IntroScene GraphTypes synthetic:10000
+
+HISTORY_FILE = MODULE_DIR / "media" / "benchmarks" / "history.jsonl"
+SYNTHETIC_SIZES = (1000, 10000, 100000)
+BASELINE_RUNS = 5
+
+_phases = {}
+# Encoding is timed on manim's writer thread, rasterization on the main one
+_phases_lock = threading.Lock()
+
+
+class _Timer:
+    def __init__(self, phase):
+        self.phase = phase
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info):
+        elapsed = time.perf_counter() - self.start
+        with _phases_lock:
+            _phases[self.phase] = _phases.get(self.phase, 0.0) + elapsed
+
+
+class TimedCamera(Camera):
+    def capture_mobjects(self, mobjects, **kwargs):
+        with _Timer("raster"):
+            super().capture_mobjects(mobjects, **kwargs)
+
+
+class TimedFileWriter(SceneFileWriter):
+    frames = 0
+
+    def write_frame(self, frame_or_renderer, num_frames=1):
+        self.frames += num_frames
+        super().write_frame(frame_or_renderer, num_frames)
+
+    def encode_and_write_frame(self, frame, num_frames):
+        with _Timer("encode"):
+            super().encode_and_write_frame(frame, num_frames)
+
+    def close_partial_movie_stream(self):
+        with _Timer("encode"):
+            super().close_partial_movie_stream()
+
+    def finish(self):
+        with _Timer("encode"):
+            super().finish()
+
+
+def synthetic_graph(num_edges, seed=0):
+    # Jittered grid "road network": every vertex links to its right and
+    # lower neighbour, scaled to fill the frame
+    side = int(np.ceil(np.sqrt(num_edges / 2))) + 1
+    rng = np.random.default_rng(seed)
+    xs, ys = np.meshgrid(np.arange(side), np.arange(side))
+    grid = np.column_stack((xs.ravel(), ys.ravel())).astype(float)
+    grid += rng.uniform(-0.3, 0.3, grid.shape)
+    positions = np.zeros((len(grid), 3))
+    positions[:, 0] = (grid[:, 0] / (side - 1) - 0.5) * 13
+    positions[:, 1] = (grid[:, 1] / (side - 1) - 0.5) * 7
+
+    index = np.arange(side * side).reshape(side, side)
+    edges = np.concatenate((
+        np.column_stack((index[:, :-1].ravel(), index[:, 1:].ravel())),
+        np.column_stack((index[:-1, :].ravel(), index[1:, :].ravel())),
+    ))[:num_edges]
+    weights = rng.integers(1, 10, len(edges))
+    return LectureGraph(positions, edges, weights=weights)
+
+
+def synthetic_scene(num_edges):
+    class SyntheticGraph(Scene):
+        def construct(self):
+            graph = synthetic_graph(num_edges)
+            edges = graph.build_edge_bundle(stroke_width=1)
+            self.play(Create(edges), run_time=2)
+            # Weight glyphs only while they stay legible
+            if num_edges <= 10000:
+                weights = graph.build_weight_bundle(font_size=8, buff=0.02)
+                self.play(Create(weights))
+            self.wait()
+
+    SyntheticGraph.__name__ = SyntheticGraph.__qualname__ = (
+        f"SyntheticGraph{num_edges}"
+    )
+    return SyntheticGraph
+
+
+def deck_scenes():
+    return [
+        cls.__name__ for cls in vars(deck).values()
+        if inspect.isclass(cls) and issubclass(cls, Scene)
+        and cls.__module__ == deck.__name__
+    ]
+
+
+def default_specs():
+    return deck_scenes() + [f"synthetic:{size}" for size in SYNTHETIC_SIZES]
+
+
+def resolve_scene(spec):
+    # "IntroScene" or "synthetic:<edges>"
+    if spec.startswith("synthetic:"):
+        return synthetic_scene(int(spec.split(":", 1)[1]))
+    return getattr(deck, spec)
+
+
+def run_benchmark(spec, quality):
+    _phases.clear()
+    settings = render_config(quality)
+    settings.update({"disable_caching": True, "progress_bar": "none"})
+    with tempconfig(settings):
+        scene_cls = resolve_scene(spec)
+
+        class Benchmarked(scene_cls):
+            def construct(self):
+                with _Timer("construct"):
+                    super().construct()
+
+            def play(self, *args, **kwargs):
+                # wait() is a play() of a Wait animation
+                with _Timer("play"):
+                    super().play(*args, **kwargs)
+
+        Benchmarked.__name__ = scene_cls.__name__
+        layout_before = text_cache_stats()["layout_seconds"]
+        renderer = CairoRenderer(
+            camera_class=TimedCamera, file_writer_class=TimedFileWriter
+        )
+        start = time.perf_counter()
+        scene = Benchmarked(renderer=renderer)
+        scene.render()
+        wall = time.perf_counter() - start
+
+    text = text_cache_stats()["layout_seconds"] - layout_before
+    frames = renderer.file_writer.frames
+    return {
+        "scene": scene_cls.__name__,
+        "quality": quality,
+        "wall": wall,
+        "construct": _phases.get("construct", 0.0) - _phases.get("play", 0.0) - text,
+        "text": text,
+        "raster": _phases.get("raster", 0.0),
+        "encode": _phases.get("encode", 0.0),
+        "frames": frames,
+        "fps": frames / wall if wall else 0.0,
+        # ru_maxrss is KiB on Linux, bytes on macOS
+        "peak_rss_mib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        / (1024**2 if sys.platform == "darwin" else 1024),
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=MODULE_DIR,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_history(path=HISTORY_FILE):
+    path = Path(path)
+    if not path.exists():
+        return []
+    with path.open(encoding="utf-8") as fp:
+        return [json.loads(line) for line in fp if line.strip()]
+
+
+def append_history(results, path=HISTORY_FILE):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("a", encoding="utf-8") as fp:
+        for result in results:
+            fp.write(json.dumps(result) + "\n")
+
+
+def baseline(history, scene, quality, runs=BASELINE_RUNS):
+    walls = [
+        entry["wall"] for entry in history
+        if entry["scene"] == scene and entry["quality"] == quality
+    ][-runs:]
+    return statistics.median(walls) if walls else None
+
+
+def regressions(results, history, threshold):
+    failed = []
+    for result in results:
+        reference = baseline(history, result["scene"], result["quality"])
+        if reference and result["wall"] > reference * (1 + threshold):
+            failed.append((result, reference))
+    return failed
+
+
+def run_suite(specs, quality="low_quality"):
+    # One process per scene, one scene at a time, so runs don't compete
+    results = []
+    for spec in specs:
+        with ProcessPoolExecutor(max_workers=1, max_tasks_per_child=1) as pool:
+            results.append(pool.submit(run_benchmark, spec, quality).result())
+        print(format_result(results[-1]), flush=True)
+    return results
+
+
+def format_result(result):
+    return (
+        f"{result['scene']:<28} {result['wall']:8.2f}s"
+        f"  construct {result['construct']:6.2f}  text {result['text']:6.2f}"
+        f"  raster {result['raster']:6.2f}  encode {result['encode']:6.2f}"
+        f"  {result['fps']:7.1f} fps  {result['peak_rss_mib']:7.1f} MiB"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark scene renders")
+    parser.add_argument(
+        "scenes", nargs="*",
+        help="scene names or synthetic:<edges> (defaults to every scene)"
+    )
+    parser.add_argument(
+        "-q", "--quality", action="append", choices=sorted(QUALITIES),
+        help="may be repeated (defaults to low_quality)"
+    )
+    parser.add_argument(
+        "--threshold", type=float, default=0.15,
+        help="allowed slowdown over the recent median, as a fraction"
+    )
+    parser.add_argument("--history", default=str(HISTORY_FILE))
+    parser.add_argument(
+        "--no-record", action="store_true",
+        help="compare against the history without appending to it"
+    )
+    args = parser.parse_args()
+
+    history = load_history(args.history)
+    revision = git_revision()
+    results = []
+    for quality in args.quality or ["low_quality"]:
+        results += run_suite(args.scenes or default_specs(), quality)
+    for result in results:
+        result.update({"time": time.time(), "revision": revision})
+
+    failed = regressions(results, history, args.threshold)
+    if not args.no_record:
+        append_history(results, args.history)
+    for result, reference in failed:
+        print(
+            f"REGRESSION {result['scene']} ({result['quality']}): "
+            f"{result['wall']:.2f}s vs median {reference:.2f}s"
+        )
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
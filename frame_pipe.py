@@ -0,0 +1,267 @@
+import multiprocessing as mp
+import queue
+import traceback
+from multiprocessing.shared_memory import SharedMemory
+
+import av
+import numpy as np
+from manim import config, logger
+from manim.scene.scene_file_writer import SceneFileWriter, to_av_frame_rate
+from manim.utils.file_ops import write_to_movie
+
+# Headless render mode that moves video encoding out of the render process.
+# Rasterized frames are copied into a small ring of reusable shared-memory
+# buffers and handed to an encoder process by slot index, so nothing is
+# pickled or piped, and Cairo can draw frame N+1 while libx264 encodes
+# frame N on another core. The ring is bounded: when every buffer is in
+# flight the renderer waits for the encoder instead of queueing frames
+# without limit.
+#
+# Frames identical to the previous one (every static wait(), the settled
+# tail of most animations) are not sent again. The encoder writes each
+# distinct frame once with a timestamp covering its whole run, plus one
+# closing copy so the partial file keeps its full duration.
+#
+#   scene = IntroScene(renderer=CairoRenderer(file_writer_class=FramePipeFileWriter))
+
+RING_SIZE = 8
+# Seconds between checks that the encoder process is still running
+ENCODER_POLL = 0.5
+
+
+def _mp_context():
+    methods = mp.get_all_start_methods()
+    return mp.get_context("fork" if "fork" in methods else "spawn")
+
+
+def stream_settings(elide_static_frames=True, width=None, height=None,
+                    frame_rate=None):
+    # Same codec choices as SceneFileWriter.open_partial_movie_stream; size
+    # and rate default to the current config
+    codec, pix_fmt = "libx264", "yuv420p"
+    options = {"an": "1", "crf": "23"}
+    if elide_static_frames:
+        # Without B-frames the last packet muxed is the last one shown, so
+        # the container duration includes the final held frame
+        options["bf"] = "0"
+    if config.movie_file_extension == ".webm":
+        codec = "libvpx-vp9"
+        options["-auto-alt-ref"] = "1"
+        if config.transparent:
+            pix_fmt = "yuva420p"
+    elif config.transparent:
+        codec, pix_fmt = "qtrle", "argb"
+    return {
+        "codec": codec,
+        "pix_fmt": pix_fmt,
+        "options": options,
+        "rate": to_av_frame_rate(frame_rate or config.frame_rate),
+        "width": width or config.pixel_width,
+        "height": height or config.pixel_height,
+    }
+
+
+class MovieStream:
+    # One movie file written with explicit timestamps, so a frame repeated
+    # N times is encoded once and the next distinct frame simply starts N
+    # frame intervals later. The last frame shown must stay valid until the
+    # next write() or close(), which adds its closing copy.
+    def __init__(self, path, settings):
+        self.container = av.open(str(path), mode="w")
+        self.stream = self.container.add_stream(
+            settings["codec"], rate=settings["rate"], options=settings["options"]
+        )
+        self.stream.pix_fmt = settings["pix_fmt"]
+        self.stream.width = settings["width"]
+        self.stream.height = settings["height"]
+        self.time_base = 1 / settings["rate"]
+        self.next_pts = 0
+        self.last = None
+        self.run = 0
+
+    def _encode(self, image, pts):
+        frame = av.VideoFrame.from_ndarray(image, format="rgba")
+        frame.pts = pts
+        frame.time_base = self.time_base
+        for packet in self.stream.encode(frame):
+            self.container.mux(packet)
+
+    def write(self, image, num_frames=1):
+        self._encode(image, self.next_pts)
+        self.next_pts += num_frames
+        self.last, self.run = image, num_frames
+
+    def extend(self, num_frames):
+        # The last frame stays on screen for ``num_frames`` more frames
+        self.next_pts += num_frames
+        self.run += num_frames
+
+    def close(self):
+        if self.last is not None and self.run > 1:
+            self._encode(self.last, self.next_pts - 1)
+        self.last = None
+        for packet in self.stream.encode():
+            self.container.mux(packet)
+        self.container.close()
+
+
+class _Encoder:
+    # Runs in the encoder process, one partial movie file at a time; a ring
+    # slot goes back to the renderer once a different frame replaces it
+    def __init__(self, ring, free_slots):
+        self.ring = ring
+        self.free_slots = free_slots
+        self.movie = None
+        self.held = None
+
+    def open(self, path, settings):
+        self.movie = MovieStream(path, settings)
+
+    def _release_held(self):
+        if self.held is not None:
+            self.free_slots.put(self.held)
+            self.held = None
+
+    def encode(self, slot, num_frames):
+        self._release_held()
+        self.movie.write(self.ring[slot], num_frames)
+        self.held = slot
+
+    def close(self):
+        self.movie.close()
+        self.movie = None
+        self._release_held()
+
+
+def _encoder_main(shm_name, shape, commands, free_slots, closed):
+    shm = SharedMemory(name=shm_name)
+    ring = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf)
+    encoder = _Encoder(ring, free_slots)
+    try:
+        while True:
+            command, *args = commands.get()
+            if command == "frame":
+                encoder.encode(*args)
+            elif command == "open":
+                encoder.open(*args)
+            elif command == "close":
+                encoder.close()
+                closed.put(("closed", args[0]))
+            elif command == "stop":
+                break
+    except Exception:
+        # The renderer raises this instead of waiting on a dead encoder
+        closed.put(("error", traceback.format_exc()))
+    finally:
+        del ring
+        shm.close()
+
+
+class FramePipeFileWriter(SceneFileWriter):
+    ring_size = RING_SIZE
+    elide_static_frames = True
+    _pending = None
+
+    @classmethod
+    def encoding_variant(cls):
+        # Eliding encodes without B-frames, which SceneFileWriter's partials
+        # have; the two must not be concatenated into one movie
+        return "elided" if cls.elide_static_frames else ""
+
+    def _start_encoder(self):
+        context = _mp_context()
+        shape = (self.ring_size, config.pixel_height, config.pixel_width, 4)
+        self._shm = SharedMemory(create=True, size=int(np.prod(shape)))
+        self._ring = np.ndarray(shape, dtype=np.uint8, buffer=self._shm.buf)
+        self._commands = context.SimpleQueue()
+        self._free_slots = context.Queue()
+        self._closed = context.Queue()
+        for slot in range(self.ring_size):
+            self._free_slots.put(slot)
+        self._encoder = context.Process(
+            target=_encoder_main,
+            args=(self._shm.name, shape, self._commands,
+                  self._free_slots, self._closed),
+            daemon=True,
+        )
+        self._encoder.start()
+
+    def _receive(self, source):
+        # Waits on the encoder, raising instead of hanging if it has died
+        while True:
+            try:
+                return source.get(timeout=ENCODER_POLL)
+            except queue.Empty:
+                if not self._encoder.is_alive():
+                    self._encoder_failed()
+
+    def _encoder_failed(self, error=None):
+        if error is None:
+            try:
+                kind, error = self._closed.get(timeout=ENCODER_POLL)
+            except queue.Empty:
+                error = f"exit code {self._encoder.exitcode}"
+        self._stop_encoder()
+        raise RuntimeError(f"frame encoder failed: {error}")
+
+    def _stop_encoder(self):
+        if getattr(self, "_encoder", None) is None:
+            return
+        if self._encoder.is_alive():
+            self._commands.put(("stop",))
+        self._encoder.join()
+        self._encoder = None
+        del self._ring
+        self._shm.close()
+        self._shm.unlink()
+
+    def open_partial_movie_stream(self, file_path=None):
+        if file_path is None:
+            file_path = self.partial_movie_files[self.renderer.num_plays]
+        self.partial_movie_file_path = file_path
+        if getattr(self, "_encoder", None) is None:
+            self._start_encoder()
+        self._commands.put((
+            "open", str(file_path), stream_settings(self.elide_static_frames)
+        ))
+        self.elided_frames = 0
+
+    def _flush_pending(self):
+        if self._pending is not None:
+            self._commands.put(("frame", *self._pending))
+            self._pending = None
+
+    def write_frame(self, frame_or_renderer, num_frames=1):
+        if not write_to_movie():
+            return super().write_frame(frame_or_renderer, num_frames)
+        if self.elide_static_frames and self._pending is not None and \
+                np.array_equal(self._ring[self._pending[0]], frame_or_renderer):
+            # Unchanged since the last frame: extend its run instead
+            self._pending[1] += num_frames
+            self.elided_frames += num_frames
+            return
+        self._flush_pending()
+        slot = self._receive(self._free_slots)
+        np.copyto(self._ring[slot], frame_or_renderer)
+        self._pending = [slot, num_frames]
+        if not self.elide_static_frames:
+            self._flush_pending()
+        elif num_frames > 1:
+            self.elided_frames += num_frames - 1
+
+    def close_partial_movie_stream(self):
+        self._flush_pending()
+        self._commands.put(("close", str(self.partial_movie_file_path)))
+        # The partial file has to be complete before manim may combine it
+        kind, detail = self._receive(self._closed)
+        if kind == "error":
+            self._encoder_failed(detail)
+        logger.info(
+            f"Animation {self.renderer.num_plays} : Partial movie file written in %(path)s"
+            f" ({self.elided_frames} unchanged frames elided)",
+            {"path": f"'{self.partial_movie_file_path}'"},
+        )
+
+    def finish(self):
+        self._stop_encoder()
+        super().finish()
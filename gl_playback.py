@@ -0,0 +1,403 @@
+import argparse
+import os
+import time
+from pathlib import Path
+
+import moderngl
+import moderngl_window as mglw
+import numpy as np
+from manim import BLUE, DEFAULT_DOT_RADIUS, GREEN, RED, WHITE, YELLOW, config
+from manim.utils.color import color_to_rgba
+from PIL import Image
+
+import graph_theory_presentation as deck
+from graph_algorithms import POP, PUSH, RELAX, Trace, dijkstra
+from graph_io import load_graph
+from network_flow import augmenting_paths
+
+# Real-time OpenGL playback of algorithm traces, with no video encoding.
+# Vertex and edge geometry is uploaded to vertex buffers once; a trace is
+# turned into flat per-step colour changes, and moving to another step only
+# rewrites the colour range those steps touched. Steps can be taken in
+# either direction, so a presenter can scrub a Dijkstra or max-flow run
+# back and forth at display rate on large graphs:
+#
+#   python gl_playback.py GraphProblems
+#   python gl_playback.py roads.gr --source 0
+#   python gl_playback.py ConnectivityAndFlow --headless -o media/playback
+#
+# Keys: space play/pause, left/right one step, up/down speed, home/end.
+# --headless renders offscreen through an EGL context; with Mesa installed
+# it runs on the llvmpipe software rasterizer on CPU-only machines.
+
+VERTEX, EDGE = 0, 1
+
+VERTEX_SHADER = """
+#version 330
+uniform vec2 scale;
+uniform vec2 offset;
+uniform float point_size;
+in vec2 in_position;
+in vec4 in_color;
+out vec4 color;
+void main() {
+    gl_Position = vec4((in_position - offset) * scale, 0.0, 1.0);
+    gl_PointSize = point_size;
+    color = in_color;
+}
+"""
+
+FRAGMENT_SHADER = """
+#version 330
+uniform bool round_points;
+in vec4 color;
+out vec4 fragment;
+void main() {
+    if (round_points && length(gl_PointCoord - 0.5) > 0.5) discard;
+    fragment = color;
+}
+"""
+
+
+def rgba(color, opacity=1.0):
+    if isinstance(color, np.ndarray):
+        return color.astype(np.float32)
+    return np.asarray(color_to_rgba(color, opacity), dtype=np.float32)
+
+
+class ColorChanges:
+    # Flat colour changes grouped by step: step s sets the vertex or edge
+    # ids[j] (targets[j] says which) to colors[j] for indptr[s] <= j < indptr[s + 1]
+    def __init__(self, targets, ids, colors, steps, num_steps):
+        order = np.argsort(steps, kind="stable")
+        self.targets = np.asarray(targets, dtype=np.int8)[order]
+        self.ids = np.asarray(ids, dtype=np.int64)[order]
+        self.colors = np.asarray(colors, dtype=np.float32).reshape(-1, 4)[order]
+        self.indptr = np.searchsorted(
+            np.asarray(steps)[order], np.arange(num_steps + 1)
+        )
+
+    @property
+    def num_steps(self):
+        return len(self.indptr) - 1
+
+
+def trace_changes(trace, kinds=(POP,), visit_color=GREEN, frontier_color=YELLOW):
+    # One step per kept trace record: pops colour the vertex and the edge it
+    # was reached by, pushes and relaxations mark the frontier
+    kind = np.asarray(trace.kinds, dtype=np.int8)
+    vertex = np.asarray(trace.vertices, dtype=np.int64)
+    edge = np.asarray(trace.edge_ids, dtype=np.int64)
+    keep = np.isin(kind, kinds)
+    kind, vertex, edge = kind[keep], vertex[keep], edge[keep]
+    steps = np.arange(len(kind))
+    visit, frontier = rgba(visit_color), rgba(frontier_color)
+
+    colors_vertex = kind != RELAX
+    colors_edge = (kind == RELAX) | ((kind == POP) & (edge >= 0))
+    return ColorChanges(
+        np.concatenate((
+            np.full(colors_vertex.sum(), VERTEX), np.full(colors_edge.sum(), EDGE)
+        )),
+        np.concatenate((vertex[colors_vertex], edge[colors_edge])),
+        np.concatenate((
+            np.where((kind[colors_vertex] == POP)[:, None], visit, frontier),
+            np.where((kind[colors_edge] == POP)[:, None], visit, frontier),
+        )),
+        np.concatenate((steps[colors_vertex], steps[colors_edge])),
+        len(kind),
+    )
+
+
+def flow_color(flow, capacity):
+    # Empty edges are faint blue, saturated ones solid red
+    ratio = np.clip(np.abs(flow) / np.maximum(capacity, 1e-12), 0, 1)[:, None]
+    empty, full = rgba(BLUE, 0.35), rgba(RED)
+    return (empty + (full - empty) * ratio).astype(np.float32)
+
+
+def flow_changes(graph, source, sink):
+    # One step per augmenting path, recolouring the edges on it
+    capacities = np.asarray(graph.capacities, dtype=float)
+    ids, colors, steps = [], [], []
+    for step, (edge_ids, _, flow) in enumerate(augmenting_paths(graph, source, sink)):
+        ids.append(edge_ids)
+        colors.append(flow_color(flow[edge_ids], capacities[edge_ids]))
+        steps.append(np.full(len(edge_ids), step))
+    num_steps = len(steps)
+    if not steps:
+        ids, colors, steps = [[]], [np.zeros((0, 4))], [[]]
+    ids = np.concatenate(ids)
+    return ColorChanges(
+        np.full(len(ids), EDGE), ids, np.concatenate(colors),
+        np.concatenate(steps), num_steps,
+    )
+
+
+class TracePlayback:
+    # CPU copies of the vertex and edge colours at the current step, plus
+    # the colour each change overwrote so steps can be undone
+    def __init__(self, graph, changes, vertex_color=WHITE, edge_color=WHITE):
+        self.graph = graph
+        self.changes = changes
+        self.colors = {
+            VERTEX: np.tile(rgba(vertex_color), (graph.num_vertices, 1)),
+            EDGE: np.tile(rgba(edge_color), (graph.num_edges, 1)),
+        }
+        self.before = self._before()
+        self.step = 0
+        self.dirty = {VERTEX: None, EDGE: None}
+
+    def _before(self):
+        # The previous change to the same vertex or edge, or its start colour
+        changes = self.changes
+        order = np.lexsort((np.arange(len(changes.ids)), changes.ids, changes.targets))
+        targets, ids = changes.targets[order], changes.ids[order]
+        before = np.empty_like(changes.colors)
+        for target, colors in self.colors.items():
+            mask = targets == target
+            before[order[mask]] = colors[ids[mask]]
+        repeat = (targets[1:] == targets[:-1]) & (ids[1:] == ids[:-1])
+        before[order[1:][repeat]] = changes.colors[order[:-1][repeat]]
+        return before
+
+    @property
+    def num_steps(self):
+        return self.changes.num_steps
+
+    def _apply(self, span, colors):
+        targets, ids = self.changes.targets[span], self.changes.ids[span]
+        for target, mirror in self.colors.items():
+            mask = targets == target
+            if not mask.any():
+                continue
+            # With repeated ids the last assignment wins
+            mirror[ids[mask]] = colors[mask]
+            low, high = int(ids[mask].min()), int(ids[mask].max()) + 1
+            if self.dirty[target] is not None:
+                low = min(low, self.dirty[target][0])
+                high = max(high, self.dirty[target][1])
+            self.dirty[target] = (low, high)
+
+    def seek(self, step):
+        step = min(max(int(step), 0), self.num_steps)
+        indptr = self.changes.indptr
+        if step > self.step:
+            span = slice(indptr[self.step], indptr[step])
+            self._apply(span, self.changes.colors[span])
+        elif step < self.step:
+            span = slice(indptr[step], indptr[self.step])
+            self._apply(
+                slice(span.stop - 1, span.start - 1 if span.start else None, -1),
+                self.before[span][::-1],
+            )
+        self.step = step
+        return step
+
+    def take_dirty(self, target):
+        dirty, self.dirty[target] = self.dirty[target], None
+        return dirty
+
+
+class GraphRenderer:
+    # Static position buffers, dynamic colour buffers; edges are GL lines
+    # with both endpoints sharing the edge's colour
+    def __init__(self, ctx, playback, background=None, margin=0.05):
+        self.ctx = ctx
+        self.playback = playback
+        graph = playback.graph
+        positions = graph.positions[:, :2].astype(np.float32)
+        starts, ends = graph.endpoints()
+        segments = np.stack((starts[:, :2], ends[:, :2]), axis=1).astype(np.float32)
+
+        self.program = ctx.program(
+            vertex_shader=VERTEX_SHADER, fragment_shader=FRAGMENT_SHADER
+        )
+        self.buffers = {
+            VERTEX: ctx.buffer(playback.colors[VERTEX].tobytes(), dynamic=True),
+            EDGE: ctx.buffer(
+                np.repeat(playback.colors[EDGE], 2, axis=0).tobytes(), dynamic=True
+            ),
+        }
+        self.vertex_array = ctx.vertex_array(self.program, [
+            (ctx.buffer(positions.tobytes()), "2f", "in_position"),
+            (self.buffers[VERTEX], "4f", "in_color"),
+        ])
+        self.edge_array = ctx.vertex_array(self.program, [
+            (ctx.buffer(segments.tobytes()), "2f", "in_position"),
+            (self.buffers[EDGE], "4f", "in_color"),
+        ])
+
+        low, high = positions.min(axis=0), positions.max(axis=0)
+        self.center = (low + high) / 2
+        self.extent = np.maximum(high - low, 1e-6) * (1 + 2 * margin)
+        self.background = rgba(background or config.background_color)
+        ctx.enable(moderngl.BLEND | moderngl.PROGRAM_POINT_SIZE)
+
+    def upload(self):
+        for target, repeat in ((VERTEX, 1), (EDGE, 2)):
+            dirty = self.playback.take_dirty(target)
+            if dirty is None:
+                continue
+            low, high = dirty
+            colors = self.playback.colors[target][low:high]
+            self.buffers[target].write(
+                np.repeat(colors, repeat, axis=0).tobytes(), offset=low * repeat * 16
+            )
+
+    def render(self, size):
+        self.upload()
+        width, height = size
+        units_per_pixel = max(self.extent[0] / width, self.extent[1] / height)
+        self.program["scale"].value = (
+            2 / (width * units_per_pixel), 2 / (height * units_per_pixel)
+        )
+        self.program["offset"].value = tuple(self.center)
+        self.ctx.clear(*self.background)
+        self.program["round_points"].value = False
+        self.program["point_size"].value = 1.0
+        self.edge_array.render(moderngl.LINES)
+        self.program["round_points"].value = True
+        self.program["point_size"].value = max(
+            2 * DEFAULT_DOT_RADIUS / units_per_pixel, 2.0
+        )
+        self.vertex_array.render(moderngl.POINTS)
+
+
+def headless_context():
+    # Mesa picks llvmpipe when asked to, so no GPU or display is needed
+    os.environ.setdefault("LIBGL_ALWAYS_SOFTWARE", "1")
+    try:
+        return moderngl.create_standalone_context(backend="egl")
+    except Exception:
+        return moderngl.create_standalone_context()
+
+
+def render_headless(playback, size=(1280, 720), every=1):
+    # Yields (step, RGB image) for every ``every``-th step and the last one
+    ctx = headless_context()
+    framebuffer = ctx.simple_framebuffer(size)
+    framebuffer.use()
+    renderer = GraphRenderer(ctx, playback)
+    steps = list(range(0, playback.num_steps, every)) + [playback.num_steps]
+    for step in steps:
+        playback.seek(step)
+        renderer.render(size)
+        image = np.frombuffer(framebuffer.read(components=3), dtype=np.uint8)
+        yield step, image.reshape(size[1], size[0], 3)[::-1]
+    ctx.release()
+
+
+class PlayerWindow(mglw.WindowConfig):
+    gl_version = (3, 3)
+    title = "Trace playback"
+    window_size = (1280, 720)
+    resizable = True
+    vsync = True
+    playback = None
+    steps_per_second = 4.0
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.renderer = GraphRenderer(self.ctx, self.playback)
+        self.playing = False
+        self.position = float(self.playback.step)
+
+    def on_render(self, time, frame_time):
+        if self.playing:
+            self.position += frame_time * self.steps_per_second
+            if self.position >= self.playback.num_steps:
+                self.position = self.playback.num_steps
+                self.playing = False
+            self.playback.seek(self.position)
+        self.renderer.render(self.wnd.buffer_size)
+
+    def on_key_event(self, key, action, modifiers):
+        keys = self.wnd.keys
+        if action != keys.ACTION_PRESS:
+            return
+        if key == keys.SPACE:
+            if self.playback.step >= self.playback.num_steps:
+                self.position = 0.0
+            self.playing = not self.playing
+        elif key == keys.UP:
+            self.steps_per_second *= 2
+        elif key == keys.DOWN:
+            self.steps_per_second /= 2
+        else:
+            targets = {
+                keys.RIGHT: self.playback.step + 1,
+                keys.LEFT: self.playback.step - 1,
+                keys.HOME: 0,
+                keys.END: self.playback.num_steps,
+            }
+            if key in targets:
+                self.playing = False
+                self.position = float(self.playback.seek(targets[key]))
+
+
+def play(playback, steps_per_second=4.0):
+    window = type("PlayerWindow", (PlayerWindow,), {
+        "playback": playback, "steps_per_second": steps_per_second,
+    })
+    mglw.run_window_config(window, args=[])
+
+
+def scene_playback(name, source=0, target=None):
+    # The trace a graph scene plays, or Dijkstra on a graph file
+    if name == "GraphProblems":
+        graph, source, target = deck.shortest_path_network(), 0, 2
+    elif name == "ConnectivityAndFlow":
+        graph = deck.max_flow_network()
+        return TracePlayback(
+            graph, flow_changes(graph, 0, 1),
+            edge_color=flow_color(np.zeros(1), np.ones(1))[0],
+        )
+    elif Path(name).exists():
+        graph = load_graph(name).to_lecture_graph()
+    else:
+        raise ValueError(f"no trace for {name!r}")
+    trace = Trace()
+    dijkstra(graph, source, target=target, trace=trace)
+    return TracePlayback(graph, trace_changes(trace, kinds=(POP, PUSH)))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Play an algorithm trace with OpenGL"
+    )
+    parser.add_argument(
+        "scene", help="GraphProblems, ConnectivityAndFlow or a graph file"
+    )
+    parser.add_argument("--source", type=int, default=0)
+    parser.add_argument("--target", type=int)
+    parser.add_argument("--speed", type=float, default=4.0, help="steps per second")
+    parser.add_argument(
+        "--headless", action="store_true",
+        help="render offscreen instead of opening a window"
+    )
+    parser.add_argument("-o", "--output", help="write headless frames as PNGs here")
+    parser.add_argument("--every", type=int, default=1, help="headless step stride")
+    parser.add_argument("--size", type=int, nargs=2, default=(1280, 720))
+    args = parser.parse_args()
+
+    playback = scene_playback(args.scene, args.source, args.target)
+    if not args.headless:
+        play(playback, args.speed)
+        return
+    output = Path(args.output) if args.output else None
+    if output is not None:
+        output.mkdir(parents=True, exist_ok=True)
+    start = time.perf_counter()
+    frames = 0
+    for step, image in render_headless(playback, tuple(args.size), args.every):
+        frames += 1
+        if output is not None:
+            Image.fromarray(image).save(output / f"step_{step:06d}.png")
+    elapsed = time.perf_counter() - start
+    print(f"{frames} frames, {playback.num_steps} steps in {elapsed:.2f}s "
+          f"({frames / max(elapsed, 1e-9):.1f} fps)")
+
+
+if __name__ == "__main__":
+    main()
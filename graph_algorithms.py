@@ -0,0 +1,227 @@
+import heapq
+from array import array
+from collections import deque
+
+import numpy as np
+from manim import GREEN, YELLOW, Indicate
+
+# Shortest-path algorithms that actually run on a LectureGraph. Adjacency is
+# a CSR view built with one argsort, and every run can record a compact step
+# trace (frontier pushes, pops and edge relaxations) that the scenes replay
+# as highlight animations. Tracing stays cheap on 100k+ edge graphs because
+# steps are appended to typed arrays; only the steps a scene decides to show
+# ever become mobjects.
+
+PUSH, POP, RELAX = 0, 1, 2
+
+
+class Trace:
+    def __init__(self):
+        self.kinds = array("b")
+        self.vertices = array("i")
+        self.edge_ids = array("i")
+        self.values = array("d")
+
+    def record(self, kind, vertex, edge_id=-1, value=0.0):
+        self.kinds.append(kind)
+        self.vertices.append(vertex)
+        self.edge_ids.append(edge_id)
+        self.values.append(value)
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def __iter__(self):
+        return zip(self.kinds, self.vertices, self.edge_ids, self.values)
+
+    def steps(self, kinds=(PUSH, POP, RELAX)):
+        return (step for step in self if step[0] in kinds)
+
+    def count(self, kinds=(PUSH, POP, RELAX)):
+        return sum(self.kinds.count(kind) for kind in kinds)
+
+
+class Adjacency:
+    # Outgoing arcs of vertex v are indices[indptr[v]:indptr[v + 1]], with
+    # the matching edge ids and weights at the same positions
+    def __init__(self, graph):
+        n = graph.num_vertices
+        sources, targets = graph.edges[:, 0], graph.edges[:, 1]
+        edge_ids = np.arange(graph.num_edges)
+        weights = edge_weights(graph)
+        if not graph.directed:
+            sources, targets = (
+                np.concatenate((sources, targets)),
+                np.concatenate((targets, sources)),
+            )
+            edge_ids = np.concatenate((edge_ids, edge_ids))
+            weights = np.concatenate((weights, weights))
+
+        order = np.argsort(sources, kind="stable")
+        self.indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=n), out=self.indptr[1:])
+        self.indices = targets[order]
+        self.edge_ids = edge_ids[order]
+        self.weights = weights[order]
+        self.sources = sources
+        self.targets = targets
+        self.arc_weights = weights
+
+
+def edge_weights(graph):
+    if graph.weights is None:
+        return np.ones(graph.num_edges)
+    return np.asarray(graph.weights, dtype=float)
+
+
+def _heap_search(graph, source, target, trace, heuristic):
+    adjacency = Adjacency(graph)
+    indptr, indices = adjacency.indptr.tolist(), adjacency.indices.tolist()
+    arc_edges, arc_weights = adjacency.edge_ids.tolist(), adjacency.weights.tolist()
+
+    n = graph.num_vertices
+    dist = [np.inf] * n
+    parent_edge = [-1] * n
+    done = [False] * n
+    dist[source] = 0.0
+    frontier = [(heuristic(source), source)]
+    if trace is not None:
+        trace.record(PUSH, source, -1, 0.0)
+
+    while frontier:
+        _, u = heapq.heappop(frontier)
+        if done[u]:
+            continue
+        done[u] = True
+        if trace is not None:
+            trace.record(POP, u, parent_edge[u], dist[u])
+        if u == target:
+            break
+        for arc in range(indptr[u], indptr[u + 1]):
+            v = indices[arc]
+            candidate = dist[u] + arc_weights[arc]
+            if candidate < dist[v]:
+                dist[v] = candidate
+                parent_edge[v] = arc_edges[arc]
+                heapq.heappush(frontier, (candidate + heuristic(v), v))
+                if trace is not None:
+                    trace.record(RELAX, v, arc_edges[arc], candidate)
+                    trace.record(PUSH, v, arc_edges[arc], candidate)
+
+    return np.array(dist), np.array(parent_edge)
+
+
+def dijkstra(graph, source, target=None, trace=None):
+    return _heap_search(graph, source, target, trace, lambda v: 0.0)
+
+
+def a_star(graph, source, target, trace=None):
+    # Straight-line distance scaled by the smallest weight/length ratio, so
+    # the heuristic never overestimates on arbitrary lecture weights
+    starts, ends = graph.endpoints()
+    lengths = np.linalg.norm(ends - starts, axis=1)
+    ratios = edge_weights(graph)[lengths > 0] / lengths[lengths > 0]
+    scale = max(float(ratios.min()), 0.0) if len(ratios) else 0.0
+    remaining = (
+        scale * np.linalg.norm(graph.positions - graph.positions[target], axis=1)
+    ).tolist()
+    return _heap_search(graph, source, target, trace, remaining.__getitem__)
+
+
+def bfs(graph, source, trace=None):
+    adjacency = Adjacency(graph)
+    indptr, indices = adjacency.indptr.tolist(), adjacency.indices.tolist()
+    arc_edges = adjacency.edge_ids.tolist()
+
+    hops = [-1] * graph.num_vertices
+    parent_edge = [-1] * graph.num_vertices
+    hops[source] = 0
+    queue = deque([source])
+    if trace is not None:
+        trace.record(PUSH, source, -1, 0)
+
+    while queue:
+        u = queue.popleft()
+        if trace is not None:
+            trace.record(POP, u, parent_edge[u], hops[u])
+        for arc in range(indptr[u], indptr[u + 1]):
+            v = indices[arc]
+            if hops[v] < 0:
+                hops[v] = hops[u] + 1
+                parent_edge[v] = arc_edges[arc]
+                queue.append(v)
+                if trace is not None:
+                    trace.record(PUSH, v, arc_edges[arc], hops[v])
+
+    return np.array(hops), np.array(parent_edge)
+
+
+def bellman_ford(graph, source):
+    # Each round relaxes every arc at once; stops early once nothing changes
+    adjacency = Adjacency(graph)
+    sources, targets = adjacency.sources, adjacency.targets
+    weights = adjacency.arc_weights
+    arc_edges = np.concatenate(
+        (np.arange(graph.num_edges),) * (1 if graph.directed else 2)
+    )
+
+    dist = np.full(graph.num_vertices, np.inf)
+    dist[source] = 0.0
+    parent_edge = np.full(graph.num_vertices, -1)
+    for _ in range(graph.num_vertices):
+        candidates = dist[sources] + weights
+        best = np.full(graph.num_vertices, np.inf)
+        np.minimum.at(best, targets, candidates)
+        improved = best < dist
+        if not improved.any():
+            return dist, parent_edge
+        winners = improved[targets] & (candidates == best[targets])
+        parent_edge[targets[winners]] = arc_edges[winners]
+        dist[improved] = best[improved]
+    raise ValueError("graph contains a negative-weight cycle")
+
+
+def floyd_warshall(graph):
+    # O(n^3) all-pairs distances, one broadcast minimum per pivot vertex
+    n = graph.num_vertices
+    dist = np.full((n, n), np.inf)
+    np.fill_diagonal(dist, 0.0)
+    sources, targets = graph.edges[:, 0], graph.edges[:, 1]
+    weights = edge_weights(graph)
+    np.minimum.at(dist, (sources, targets), weights)
+    if not graph.directed:
+        np.minimum.at(dist, (targets, sources), weights)
+
+    successor = np.where(np.isfinite(dist), np.arange(n)[None, :], -1)
+    for k in range(n):
+        through_k = dist[:, k, None] + dist[None, k, :]
+        shorter = through_k < dist
+        dist = np.where(shorter, through_k, dist)
+        successor = np.where(shorter, successor[:, k, None], successor)
+    if (np.diag(dist) < 0).any():
+        raise ValueError("graph contains a negative-weight cycle")
+    return dist, successor
+
+
+def path_edge_ids(graph, parent_edge, target):
+    # Walk parent edges back from target; [] when target is unreachable
+    path = []
+    vertex = target
+    while parent_edge[vertex] >= 0:
+        edge_id = int(parent_edge[vertex])
+        path.append(edge_id)
+        u, v = graph.edges[edge_id]
+        vertex = u if v == vertex else v
+    return path[::-1]
+
+
+def trace_animations(trace, vertices, edges, kinds=(POP,),
+                     visit_color=GREEN, frontier_color=YELLOW):
+    # Lazily turn the chosen steps into highlight animations
+    for kind, vertex, edge_id, _ in trace.steps(kinds):
+        if kind == POP:
+            yield vertices[vertex].animate.set_color(visit_color)
+        elif kind == PUSH:
+            yield Indicate(vertices[vertex], color=frontier_color)
+        elif kind == RELAX:
+            yield Indicate(edges[edge_id], color=frontier_color, scale_factor=1)
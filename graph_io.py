@@ -0,0 +1,304 @@
+import gzip
+import hashlib
+import json
+import re
+import shutil
+import warnings
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+import numpy as np
+from manim import config
+
+from graph_layout import layout_graph
+from lecture_graph import LectureGraph
+
+# Graph files into compact integer edge arrays. Edge lists ("u v [w]"),
+# DIMACS shortest-path (.gr) / max-flow (.max) files and GraphML are read in
+# fixed-size blocks of whole lines; numeric blocks are parsed by NumPy in one
+# call and appended straight to raw int32/float64 files, so memory stays at
+# one block however large the input. The files are then memory-mapped, and
+# a second load of an unchanged input maps the stored arrays right away:
+#
+#   data = load_graph("USA-road-d.NY.gr.gz")
+#   graph = data.to_lecture_graph(method="spectral")
+
+BLOCK_SIZE = 16 * 1024**2
+DEFAULT_CACHE_DIR = "graph_data"
+
+
+class GraphData:
+    # Memory-mapped edges (int32, shape (m, 2)) plus optional per-edge values
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        with (self.directory / "meta.json").open(encoding="utf-8") as fp:
+            self.meta = json.load(fp)
+        self.num_vertices = self.meta["num_vertices"]
+        self.num_edges = self.meta["num_edges"]
+        self.directed = self.meta["directed"]
+        self.source = self.meta.get("source")
+        self.sink = self.meta.get("sink")
+        self.labels = self.meta.get("labels")
+        self.edges = self._map("edges.i32", np.int32, (self.num_edges, 2))
+        self.values = None
+        if self.meta["has_values"]:
+            self.values = self._map("values.f64", np.float64, (self.num_edges,))
+
+    def _map(self, name, dtype, shape):
+        if shape[0] == 0:
+            return np.zeros(shape, dtype=dtype)
+        return np.memmap(self.directory / name, dtype=dtype, mode="r", shape=shape)
+
+    def to_lecture_graph(self, positions=None, method="force", **kwargs):
+        # Values become capacities for max-flow inputs, weights otherwise
+        key = "capacities" if self.meta["format"] == "dimacs-max" else "weights"
+        if self.values is not None:
+            kwargs.setdefault(key, np.asarray(self.values))
+        kwargs.setdefault("labels", self.labels)
+        edges = np.asarray(self.edges)
+        if positions is None:
+            return layout_graph(
+                edges, self.num_vertices, method=method,
+                directed=self.directed, **kwargs
+            )
+        return LectureGraph(positions, edges, directed=self.directed, **kwargs)
+
+
+class _EdgeWriter:
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.edges = (self.directory / "edges.i32").open("wb")
+        self.values = (self.directory / "values.f64").open("wb")
+        self.num_edges = 0
+        self.max_vertex = -1
+        self.has_values = False
+
+    def append(self, sources, targets, values=None):
+        if len(sources) == 0:
+            return
+        largest = max(int(sources.max()), int(targets.max()))
+        if largest >= 2**31 or min(int(sources.min()), int(targets.min())) < 0:
+            raise ValueError("vertex ids must fit in 0..2**31-1")
+        self.max_vertex = max(self.max_vertex, largest)
+        np.column_stack((sources, targets)).astype(np.int32).tofile(self.edges)
+        if values is not None:
+            self.has_values = True
+            np.asarray(values, dtype=np.float64).tofile(self.values)
+        self.num_edges += len(sources)
+
+    def close(self, **meta):
+        self.edges.close()
+        self.values.close()
+        meta.setdefault("num_vertices", self.max_vertex + 1)
+        meta.update(num_edges=self.num_edges, has_values=self.has_values)
+        with (self.directory / "meta.json").open("w", encoding="utf-8") as fp:
+            json.dump(meta, fp)
+
+
+def _open(path):
+    path = Path(path)
+    return gzip.open(path, "rb") if path.suffix == ".gz" else path.open("rb")
+
+
+def _blocks(path, block_size=BLOCK_SIZE):
+    # Whole lines, about ``block_size`` bytes at a time
+    with _open(path) as fp:
+        tail = b""
+        while True:
+            data = fp.read(block_size)
+            if not data:
+                if tail.strip():
+                    yield tail + b"\n"
+                return
+            data = tail + data
+            cut = data.rfind(b"\n") + 1
+            tail = data[cut:]
+            if cut:
+                yield data[:cut]
+
+
+def _parse_numbers(block):
+    # Every whitespace-separated number in the block, or None if it holds
+    # anything that is not a number. fromstring reads a blank block as [-1.]
+    if not block.strip():
+        return np.empty(0)
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", DeprecationWarning)
+        try:
+            return np.fromstring(block, dtype=np.float64, sep=" ")
+        except (DeprecationWarning, ValueError):
+            return None
+
+
+def _append_rows(writer, numbers, columns, index_base, source):
+    if numbers.size % columns:
+        raise ValueError(f"{source}: rows do not all have {columns} columns")
+    rows = numbers.reshape(-1, columns)
+    ids = rows[:, :2].astype(np.int64) - index_base
+    writer.append(ids[:, 0], ids[:, 1], rows[:, 2] if columns > 2 else None)
+
+
+def _read_edge_list(path, writer, index_base):
+    columns = None
+    labels = {}
+    for block in _blocks(path):
+        block = block.replace(b",", b" ")
+        if b"#" in block or b"%" in block:
+            block = b"".join(
+                line for line in block.splitlines(keepends=True)
+                if not line.lstrip().startswith((b"#", b"%"))
+            )
+        if columns is None:
+            first = next((line.split() for line in block.splitlines() if line.strip()), None)
+            if first is None:
+                continue
+            columns = len(first)
+        numbers = None if labels else _parse_numbers(block)
+        if numbers is not None:
+            _append_rows(writer, numbers, columns, index_base, path)
+            continue
+        # Named vertices: slow path, numbered in order of appearance
+        rows = [line.split() for line in block.splitlines() if line.strip()]
+        ids = np.array([
+            [labels.setdefault(name.decode(), len(labels)) for name in row[:2]]
+            for row in rows
+        ]).reshape(-1, 2)
+        values = [float(row[2]) for row in rows] if columns > 2 else None
+        writer.append(ids[:, 0], ids[:, 1], values)
+    return {"labels": list(labels)} if labels else {}
+
+
+def _read_dimacs(path, writer):
+    # Arc lines "a u v value" with 1-based vertices; "p sp|max n m" header,
+    # "n id s|t" marks the max-flow source and sink
+    meta = {"format": "dimacs-sp"}
+    for block in _blocks(path):
+        if re.search(rb"^[^a\s]", block, re.M):
+            arcs = []
+            for line in block.splitlines():
+                fields = line.split()
+                if not fields:
+                    continue
+                if fields[0] == b"p":
+                    meta["format"] = f"dimacs-{fields[1].decode()}"
+                    meta["num_vertices"] = int(fields[2])
+                elif fields[0] == b"n" and len(fields) > 2:
+                    meta["source" if fields[2] == b"s" else "sink"] = int(fields[1]) - 1
+                elif fields[0] == b"a":
+                    arcs.append(line)
+            block = b"\n".join(arcs) + b"\n"
+        numbers = _parse_numbers(block.replace(b"a", b" "))
+        if numbers is None:
+            raise ValueError(f"{path}: malformed DIMACS arc lines")
+        _append_rows(writer, numbers, 3, 1, path)
+    return meta
+
+
+def _read_graphml(path, writer):
+    # Streams <node>/<edge> elements; the first numeric edge attribute named
+    # weight, capacity or length becomes the edge value
+    index = {}
+    value_keys = set()
+    directed = False
+    sources, targets, values = [], [], []
+
+    def flush():
+        writer.append(
+            np.array(sources, dtype=np.int64), np.array(targets, dtype=np.int64),
+            values if value_keys and values else None,
+        )
+        sources.clear()
+        targets.clear()
+        values.clear()
+
+    graph = None
+    with _open(path) as fp:
+        for event, element in ET.iterparse(fp, events=("start", "end")):
+            tag = element.tag.rsplit("}", 1)[-1]
+            if event == "start":
+                if tag == "graph":
+                    graph = element
+                    directed = element.get("edgedefault") == "directed"
+                continue
+            if tag == "key" and element.get("for") in ("edge", "all") and \
+                    element.get("attr.name") in ("weight", "capacity", "length"):
+                value_keys.add(element.get("id"))
+            elif tag == "node":
+                index.setdefault(element.get("id"), len(index))
+                element.clear()
+            elif tag == "edge":
+                for end, column in (("source", sources), ("target", targets)):
+                    column.append(index.setdefault(element.get(end), len(index)))
+                if value_keys:
+                    value = 1.0
+                    for data in element:
+                        if data.get("key") in value_keys:
+                            value = float(data.text)
+                            break
+                    values.append(value)
+                element.clear()
+                if len(sources) >= 100_000:
+                    flush()
+            if tag in ("node", "edge") and graph is not None:
+                # Cleared elements stay attached to <graph> until removed
+                graph.clear()
+    flush()
+    return {
+        "directed": directed,
+        "num_vertices": len(index),
+        "labels": list(index),
+    }
+
+
+def detect_format(path):
+    suffixes = [suffix.lower() for suffix in Path(path).suffixes if suffix != ".gz"]
+    suffix = suffixes[-1] if suffixes else ""
+    if suffix in (".graphml", ".xml"):
+        return "graphml"
+    if suffix in (".gr", ".max", ".dimacs"):
+        return "dimacs"
+    return "edgelist"
+
+
+def _cache_directory(path, fmt, options, cache_dir):
+    stat = Path(path).stat()
+    key = hashlib.sha256(repr((
+        str(Path(path).resolve()), stat.st_size, stat.st_mtime_ns, fmt,
+        sorted(options.items()),
+    )).encode()).hexdigest()[:24]
+    root = Path(cache_dir) if cache_dir else Path(config.media_dir) / DEFAULT_CACHE_DIR
+    return root / key
+
+
+def load_graph(path, format=None, directed=None, index_base=0, cache_dir=None):
+    fmt = format or detect_format(path)
+    directory = _cache_directory(
+        path, fmt, {"directed": directed, "index_base": index_base}, cache_dir
+    )
+    if not (directory / "meta.json").exists():
+        partial = directory.with_name(directory.name + ".partial")
+        shutil.rmtree(partial, ignore_errors=True)
+        writer = _EdgeWriter(partial)
+        try:
+            if fmt == "graphml":
+                meta = _read_graphml(path, writer)
+            elif fmt == "dimacs":
+                meta = _read_dimacs(path, writer)
+                meta.setdefault("directed", True)
+            elif fmt == "edgelist":
+                meta = _read_edge_list(path, writer, index_base)
+            else:
+                raise ValueError(f"unknown graph format {fmt!r}")
+        except BaseException:
+            writer.close()
+            shutil.rmtree(partial, ignore_errors=True)
+            raise
+        meta.setdefault("format", fmt)
+        meta.setdefault("directed", False)
+        if directed is not None:
+            meta["directed"] = directed
+        meta["path"] = str(path)
+        writer.close(**meta)
+        partial.rename(directory)
+    return GraphData(directory)
@@ -0,0 +1,376 @@
+import hashlib
+import os
+from collections import OrderedDict, deque
+from pathlib import Path
+
+import numpy as np
+from manim import config
+from scipy import sparse
+from scipy.sparse.linalg import eigsh
+
+from lecture_graph import LectureGraph
+
+# Vertex positions for graphs that are not hand-placed. Three layouts:
+#
+#   force     Fruchterman-Reingold. Repulsion is exact below EXACT_LIMIT
+#             vertices and Barnes-Hut style above it: every vertex feels
+#             its neighbouring leaves exactly and farther quadtree cells
+#             as point masses, coarser the farther away they are, so an
+#             iteration is O(n log n) array work instead of O(n^2).
+#   spectral  Laplacian eigenvectors (Fiedler coordinates).
+#   layered   Longest-path layers for DAGs, BFS depth for trees, ordered
+#             within each layer by barycenter sweeps.
+#
+# Layouts are memoized by a hash of the graph and the layout parameters, in
+# memory and as .npy files under media/graph_layouts, so re-renders reuse
+# them. Positions come back fitted to the frame, ready for LectureGraph:
+#
+#   graph = layout_graph(edges, method="force", weights=weights)
+#   self.play(Create(graph.build_edges()), Create(graph.build_vertices()))
+
+EXACT_LIMIT = 2000
+LEAF_SIZE = 4
+MAX_LEVEL = 10
+MAX_LAYOUTS = 64
+
+_layouts = OrderedDict()
+
+
+def _edge_array(edges):
+    edges = np.asarray(edges)
+    if edges.size == 0:
+        return np.zeros((0, 2), dtype=np.int64)
+    return edges[:, :2].astype(np.int64)
+
+
+def graph_hash(num_vertices, edges, directed=False):
+    digest = hashlib.sha256()
+    digest.update(repr((num_vertices, directed)).encode())
+    digest.update(np.ascontiguousarray(_edge_array(edges)).tobytes())
+    return digest.hexdigest()[:32]
+
+
+def _undirected_adjacency(num_vertices, edges):
+    rows = np.concatenate((edges[:, 0], edges[:, 1]))
+    cols = np.concatenate((edges[:, 1], edges[:, 0]))
+    adjacency = sparse.csr_array(
+        (np.ones(len(rows)), (rows, cols)), shape=(num_vertices, num_vertices)
+    )
+    adjacency.data[:] = 1
+    adjacency.setdiag(0)
+    adjacency.eliminate_zeros()
+    return adjacency
+
+
+def _exact_repulsion(positions, k2, chunk=1024):
+    forces = np.zeros_like(positions)
+    for start in range(0, len(positions), chunk):
+        delta = positions[start:start + chunk, None, :] - positions[None, :, :]
+        dist2 = np.maximum((delta**2).sum(axis=2), 1e-12)
+        forces[start:start + chunk] = (delta * (k2 / dist2)[:, :, None]).sum(axis=1)
+    return forces
+
+
+def _far_field(points, cx, cy, size, mass, centroid, k2):
+    # Repulsion at ``points`` (lying in cells cx, cy) from the children of
+    # their parent cell's neighbours that are not neighbours themselves:
+    # the 6x6 block around the parent minus the 3x3 block around the cell.
+    # Also returns its Jacobian, to carry the force to nearby points.
+    offsets = np.arange(-2, 4)
+    x = 2 * (cx // 2)[:, None, None] + offsets[None, :, None]
+    y = 2 * (cy // 2)[:, None, None] + offsets[None, None, :]
+    valid = (x >= 0) & (x < size) & (y >= 0) & (y < size)
+    valid &= (np.abs(x - cx[:, None, None]) > 1) | (np.abs(y - cy[:, None, None]) > 1)
+    cells = np.where(valid, y * size + x, 0)
+    delta = points[:, None, None, :] - centroid[cells]
+    dist2 = np.maximum((delta**2).sum(axis=3), 1e-12)
+    weight = np.where(valid, mass[cells], 0.0) * k2 / dist2
+    force = (delta * weight[..., None]).sum(axis=(1, 2))
+    # d/dp of w(p - q) / |p - q|^2 is w (I - 2 d d^T / |d|^2) / |d|^2
+    outer = delta[..., :, None] * delta[..., None, :] / dist2[..., None, None]
+    jacobian = (weight[..., None, None] * (np.eye(2) - 2 * outer)).sum(axis=(1, 2))
+    return force, jacobian
+
+
+def _cells(positions, size):
+    cx = np.minimum((positions[:, 0] * size).astype(np.int64), size - 1)
+    cy = np.minimum((positions[:, 1] * size).astype(np.int64), size - 1)
+    return cx, cy
+
+
+def _near_field(positions, cx, cy, size, k2, chunk=4096):
+    # Exact repulsion from every vertex in the 3x3 block of finest cells
+    # around each vertex (itself included, which adds nothing)
+    flat = cy * size + cx
+    order = np.argsort(flat, kind="stable")
+    count = np.bincount(flat, minlength=size * size)
+    first = np.concatenate(([0], np.cumsum(count)[:-1]))
+    offsets = np.array([(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1)])
+    forces = np.zeros_like(positions)
+    for start in range(0, len(positions), chunk):
+        part = np.arange(start, min(start + chunk, len(positions)))
+        x = cx[part, None] + offsets[:, 0]
+        y = cy[part, None] + offsets[:, 1]
+        valid = (x >= 0) & (x < size) & (y >= 0) & (y < size)
+        cells = np.where(valid, y * size + x, 0).ravel()
+        counts = np.where(valid.ravel(), count[cells], 0)
+        # One (vertex, neighbour) pair per vertex in each neighbouring cell
+        owner = np.repeat(np.repeat(np.arange(len(part)), len(offsets)), counts)
+        within = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        others = order[np.repeat(first[cells], counts) + within]
+        delta = positions[part[owner]] - positions[others]
+        dist2 = np.maximum((delta**2).sum(axis=1), 1e-12)
+        push = delta * (k2 / dist2)[:, None]
+        for axis in (0, 1):
+            forces[part, axis] = np.bincount(owner, push[:, axis], minlength=len(part))
+    return forces
+
+
+def _approximate_repulsion(positions, k2, chunk=8192):
+    # Quadtree levels 2..finest over the unit square, the finest chosen so
+    # that leaves hold about LEAF_SIZE vertices (refined further where
+    # vertices cluster, up to MAX_LEVEL). At each level every occupied cell
+    # sums its interaction list, each cell a point mass at its centre of
+    # mass, at its own centre of mass, and each vertex takes that force
+    # plus the Jacobian term for its offset from there. At the finest level
+    # the 3x3 neighbourhood is summed exactly.
+    n = len(positions)
+    finest = max(2, int(np.ceil(np.log(max(n / LEAF_SIZE, 1)) / np.log(4))))
+    while finest < MAX_LEVEL:
+        cx, cy = _cells(positions, 2**finest)
+        if np.bincount(cy * 2**finest + cx).max() <= 4 * LEAF_SIZE:
+            break
+        finest += 1
+    forces = np.zeros_like(positions)
+    for level in range(2, finest + 1):
+        size = 2**level
+        cx, cy = _cells(positions, size)
+        flat = cy * size + cx
+        mass = np.bincount(flat, minlength=size * size).astype(float)
+        centroid = np.column_stack([
+            np.bincount(flat, positions[:, axis], minlength=size * size)
+            for axis in (0, 1)
+        ]) / np.maximum(mass, 1)[:, None]
+        occupied, owner = np.unique(flat, return_inverse=True)
+        for start in range(0, len(occupied), chunk):
+            cells = occupied[start:start + chunk]
+            force, jacobian = _far_field(
+                centroid[cells], cells % size, cells // size, size, mass, centroid, k2
+            )
+            members = np.flatnonzero((owner >= start) & (owner < start + chunk))
+            local = owner[members] - start
+            offset = positions[members] - centroid[cells[local]]
+            forces[members] += force[local] + np.einsum(
+                "nij,nj->ni", jacobian[local], offset
+            )
+    return forces + _near_field(positions, cx, cy, size, k2)
+
+
+def _normalize(positions):
+    # Into [0, 1)^2, keeping the aspect ratio
+    positions = positions - positions.min(axis=0)
+    extent = positions.max() or 1.0
+    return positions / extent * (1 - 1e-9)
+
+
+def force_directed(num_vertices, edges, iterations=50, seed=0, initial=None):
+    edges = _edge_array(edges)
+    rng = np.random.default_rng(seed)
+    positions = rng.random((num_vertices, 2)) if initial is None else initial[:, :2]
+    positions = _normalize(positions)
+    if num_vertices < 2:
+        return positions
+    k = np.sqrt(1.0 / num_vertices)
+    exact = num_vertices <= EXACT_LIMIT
+    sources, targets = edges[:, 0], edges[:, 1]
+
+    temperature = 0.1
+    for step in range(iterations):
+        if exact:
+            forces = _exact_repulsion(positions, k * k)
+        else:
+            forces = _approximate_repulsion(positions, k * k)
+        delta = positions[sources] - positions[targets]
+        dist = np.sqrt((delta**2).sum(axis=1))[:, None]
+        pull = delta * dist / k
+        np.subtract.at(forces, sources, pull)
+        np.add.at(forces, targets, pull)
+
+        length = np.maximum(np.sqrt((forces**2).sum(axis=1)), 1e-12)[:, None]
+        positions = positions + forces / length * np.minimum(length, temperature)
+        positions = _normalize(positions)
+        temperature = 0.1 * (1 - (step + 1) / iterations) + 1e-3
+    return positions
+
+
+def spectral(num_vertices, edges):
+    # Eigenvectors 2 and 3 of the normalized Laplacian. Large graphs use
+    # shift-invert around zero, which converges in a couple of sparse
+    # factorizations where plain Lanczos stalls on the tiny spectral gaps
+    # of road-like graphs.
+    if num_vertices < 3:
+        return np.column_stack((np.arange(num_vertices), np.zeros(num_vertices)))
+    adjacency = _undirected_adjacency(num_vertices, _edge_array(edges))
+    degree = np.asarray(adjacency.sum(axis=1)).ravel()
+    scale = sparse.diags_array(1 / np.sqrt(np.maximum(degree, 1)))
+    laplacian = sparse.eye_array(num_vertices) - scale @ adjacency @ scale
+    if num_vertices <= 500:
+        _, vectors = np.linalg.eigh(laplacian.toarray())
+    else:
+        values, vectors = eigsh(laplacian.tocsc(), k=3, sigma=-1e-3, which="LM")
+        vectors = vectors[:, np.argsort(values)]
+    return scale @ vectors[:, 1:3]
+
+
+def layers(num_vertices, edges, directed=True, root=0):
+    edges = _edge_array(edges)
+    depth = np.full(num_vertices, -1)
+    if directed:
+        # Longest path from the sources, in topological order
+        indegree = np.bincount(edges[:, 1], minlength=num_vertices)
+        order = np.argsort(edges[:, 0], kind="stable")
+        indptr = np.concatenate(([0], np.cumsum(
+            np.bincount(edges[:, 0], minlength=num_vertices)
+        )))
+        targets, indptr = edges[order, 1].tolist(), indptr.tolist()
+        indegree = indegree.tolist()
+        queue = deque(np.flatnonzero(np.array(indegree) == 0).tolist())
+        depth[list(queue)] = 0
+        depth = depth.tolist()
+        seen = 0
+        while queue:
+            u = queue.popleft()
+            seen += 1
+            for v in targets[indptr[u]:indptr[u + 1]]:
+                depth[v] = max(depth[v], depth[u] + 1)
+                indegree[v] -= 1
+                if indegree[v] == 0:
+                    queue.append(v)
+        if seen < num_vertices:
+            raise ValueError("layered layout needs a DAG; graph has a cycle")
+        return np.array(depth)
+
+    adjacency = _undirected_adjacency(num_vertices, edges)
+    indptr, indices = adjacency.indptr.tolist(), adjacency.indices.tolist()
+    depth = depth.tolist()
+    for start in [root] + list(range(num_vertices)):
+        if depth[start] >= 0:
+            continue
+        depth[start] = 0
+        queue = deque([start])
+        while queue:
+            u = queue.popleft()
+            for v in indices[indptr[u]:indptr[u + 1]]:
+                if depth[v] < 0:
+                    depth[v] = depth[u] + 1
+                    queue.append(v)
+    return np.array(depth)
+
+
+def layered(num_vertices, edges, directed=True, root=0, sweeps=4):
+    edges = _edge_array(edges)
+    depth = layers(num_vertices, edges, directed, root)
+    adjacency = _undirected_adjacency(num_vertices, edges)
+    members = [np.flatnonzero(depth == layer) for layer in range(depth.max() + 1)]
+    x = np.zeros(num_vertices)
+    neighbours = []
+    for vertices in members:
+        x[vertices] = np.arange(len(vertices)) - (len(vertices) - 1) / 2
+        rows = adjacency[vertices]
+        neighbours.append(
+            (np.repeat(np.arange(len(vertices)), np.diff(rows.indptr)), rows.indices)
+        )
+
+    # Barycenter sweeps, down then up: order each layer by the mean position
+    # of its neighbours in the layer it is swept from
+    for sweep in range(sweeps):
+        step = -1 if sweep % 2 == 0 else 1
+        order = range(1, len(members)) if step < 0 else range(len(members) - 2, -1, -1)
+        for layer in order:
+            vertices = members[layer]
+            rows, cols = neighbours[layer]
+            keep = depth[cols] == layer + step
+            counts = np.bincount(rows[keep], minlength=len(vertices))
+            sums = np.bincount(rows[keep], x[cols[keep]], minlength=len(vertices))
+            barycenter = np.where(
+                counts > 0, sums / np.maximum(counts, 1), x[vertices]
+            )
+            ranked = vertices[np.argsort(barycenter, kind="stable")]
+            x[ranked] = np.arange(len(ranked)) - (len(ranked) - 1) / 2
+    return np.column_stack((x, -depth.astype(float)))
+
+
+def fit_to_frame(positions, width=12.0, height=6.0, center=None):
+    # Scale 2D layout coordinates uniformly into a width x height box
+    positions = np.asarray(positions, dtype=float)
+    lower, upper = positions.min(axis=0), positions.max(axis=0)
+    extent = np.where(upper - lower > 0, upper - lower, 1.0)
+    scale = min(width / extent[0], height / extent[1])
+    fitted = np.zeros((len(positions), 3))
+    fitted[:, :2] = (positions - (lower + upper) / 2) * scale
+    if center is not None:
+        fitted += center
+    return fitted
+
+
+def _disk_path(key):
+    return Path(config.media_dir) / "graph_layouts" / f"{key}.npy"
+
+
+def _remember(key, positions):
+    _layouts[key] = positions
+    if len(_layouts) > MAX_LAYOUTS:
+        _layouts.popitem(last=False)
+    return positions
+
+
+def compute_layout(num_vertices, edges, method="force", directed=False,
+                   **params):
+    # Raw 2D coordinates, memoized on the graph and the parameters
+    digest = hashlib.sha256(repr((
+        graph_hash(num_vertices, edges, directed), method
+    )).encode())
+    for name, value in sorted(params.items()):
+        # Array reprs elide their middle, so arrays (initial=) hash by content
+        if isinstance(value, np.ndarray):
+            value = (value.dtype.str, value.shape, value.tobytes())
+        digest.update(repr((name, value)).encode())
+    key = digest.hexdigest()[:32]
+    if key in _layouts:
+        _layouts.move_to_end(key)
+        return _layouts[key]
+    path = _disk_path(key)
+    if path.exists():
+        return _remember(key, np.load(path))
+
+    if method == "force":
+        positions = force_directed(num_vertices, edges, **params)
+    elif method == "spectral":
+        positions = spectral(num_vertices, edges)
+    elif method == "layered":
+        positions = layered(num_vertices, edges, directed=directed, **params)
+    else:
+        raise ValueError(f"unknown layout method {method!r}")
+
+    # Other render processes may be loading the same layout
+    path.parent.mkdir(parents=True, exist_ok=True)
+    staging = path.with_name(f".{path.stem}.{os.getpid()}.tmp.npy")
+    np.save(staging, positions)
+    os.replace(staging, path)
+    return _remember(key, positions)
+
+
+def layout_graph(edges, num_vertices=None, method="force", directed=False,
+                 width=12.0, height=6.0, center=None, layout_params=None,
+                 **graph_kwargs):
+    # A LectureGraph whose positions come from ``method``
+    edge_array = np.asarray(edges)
+    if num_vertices is None:
+        num_vertices = int(_edge_array(edge_array).max()) + 1 if len(edge_array) else 0
+    positions = compute_layout(
+        num_vertices, edge_array, method, directed, **(layout_params or {})
+    )
+    return LectureGraph(
+        fit_to_frame(positions, width, height, center), edge_array,
+        directed=directed, **graph_kwargs,
+    )
@@ -1,23 +1,34 @@
+import gc
+import os
+
 from manim import *
 
+from adjacency_view import AdjacencyView
+from graph_algorithms import POP, Trace, dijkstra, path_edge_ids, trace_animations
+from lecture_graph import EdgeBundle, LectureGraph, interleave
+from network_flow import FlowLabels, augmenting_paths, find_bridges, union_steps
+from parametric_scene import ParametricScene, as_point, as_points
+from text_cache import CachedText
+from trace_pipeline import play_trace
+
 class IntroScene(Scene):
     def construct(self):
         # Main title with favorite topic emphasis
-        title = Text("Graph Theory", font_size=72).set_color(BLUE)
+        title = CachedText("Graph Theory", font_size=72).set_color(BLUE)
         subtitle = VGroup(
-            Text("One of my favorite topics in CS", font_size=36),
-            Text("A Computer Science perspective", font_size=32),
-            Text("(Not focusing on mathematical proofs)", font_size=28)
+            CachedText("One of my favorite topics in CS", font_size=36),
+            CachedText("A Computer Science perspective", font_size=32),
+            CachedText("(Not focusing on mathematical proofs)", font_size=28)
         ).arrange(DOWN, buff=0.3)
         
         subtitle.next_to(title, DOWN, buff=1)
         
         # Key points about graph theory
         key_points = VGroup(
-            Text("• Awesome algorithms", font_size=32),
-            Text("• Very diverse field", font_size=32),
-            Text("• Huge real-world applications", font_size=32),
-            Text("• Algorithm implementation details", font_size=32)
+            CachedText("• Awesome algorithms", font_size=32),
+            CachedText("• Very diverse field", font_size=32),
+            CachedText("• Huge real-world applications", font_size=32),
+            CachedText("• Algorithm implementation details", font_size=32)
         ).arrange(DOWN, aligned_edge=LEFT, buff=0.3)
         
         key_points.next_to(subtitle, DOWN, buff=1)
@@ -38,28 +49,28 @@ class IntroScene(Scene):
 class GraphTypesOverview(Scene):
     def construct(self):
         # Title
-        title = Text("Types of Graphs", font_size=48).to_edge(UP)
+        title = CachedText("Types of Graphs", font_size=48).to_edge(UP)
         
         # Create sections for different graph types
         types_A = VGroup(
-            Text("A. Basic Types:", font_size=36),
-            Text("1. Undirected Graph", font_size=32),
-            Text("2. Directed Graph (Digraph)", font_size=32)
+            CachedText("A. Basic Types:", font_size=36),
+            CachedText("1. Undirected Graph", font_size=32),
+            CachedText("2. Directed Graph (Digraph)", font_size=32)
         ).arrange(DOWN, aligned_edge=LEFT)
         
         types_B = VGroup(
-            Text("B. Weight Types:", font_size=36),
-            Text("1. Weighted Graphs", font_size=32),
-            Text("2. Unweighted Graphs", font_size=32)
+            CachedText("B. Weight Types:", font_size=36),
+            CachedText("1. Weighted Graphs", font_size=32),
+            CachedText("2. Unweighted Graphs", font_size=32)
         ).arrange(DOWN, aligned_edge=LEFT)
         
         special_types = VGroup(
-            Text("Special Graph Types:", font_size=36),
-            Text("1. Trees", font_size=32),
-            Text("2. Rooted Trees", font_size=32),
-            Text("3. DAGs", font_size=32),
-            Text("4. Bipartite Graphs", font_size=32),
-            Text("5. Complete Graphs", font_size=32)
+            CachedText("Special Graph Types:", font_size=36),
+            CachedText("1. Trees", font_size=32),
+            CachedText("2. Rooted Trees", font_size=32),
+            CachedText("3. DAGs", font_size=32),
+            CachedText("4. Bipartite Graphs", font_size=32),
+            CachedText("5. Complete Graphs", font_size=32)
         ).arrange(DOWN, aligned_edge=LEFT)
         
         # Position the sections
@@ -79,40 +90,27 @@ class GraphTypesOverview(Scene):
 
 class GraphRepresentationScene(Scene):
     def construct(self):
-        title = Text("Representing Graphs", font_size=48).to_edge(UP)
+        title = CachedText("Representing Graphs", font_size=48).to_edge(UP)
         
         # Example graph for all representations
-        vertices = [Dot(point) for point in [LEFT*2, RIGHT*2, UP*2, DOWN*2]]
-        edges = [
-            Line(vertices[i].get_center(), vertices[j].get_center())
-            for i, j in [(0,1), (1,2), (2,3), (3,0)]
-        ]
-        graph = VGroup(*vertices, *edges)
+        example = LectureGraph(
+            [LEFT*2, RIGHT*2, UP*2, DOWN*2],
+            [(0,1), (1,2), (2,3), (3,0)]
+        )
+        graph = VGroup(*example.build_vertices(), *example.build_edges())
         
-        # Matrix representation
-        matrix = [
-            [0, 1, 0, 1],
-            [1, 0, 1, 0],
-            [0, 1, 0, 1],
-            [1, 0, 1, 0]
-        ]
-        matrix_mob = Matrix(matrix)
-        matrix_label = Text("Adjacency Matrix", font_size=32)
+        # Matrix, adjacency list and edge list, all from one adjacency array
+        adjacency = AdjacencyView(example.adjacency(), edges=example.edges)
+        matrix_mob = adjacency.build_matrix()
+        matrix_label = CachedText("Adjacency Matrix", font_size=32)
         matrix_group = VGroup(matrix_label, matrix_mob).arrange(DOWN)
         
-        # Adjacency list representation
-        adj_list = VGroup(
-            Text("1: [2, 4]", font_size=24),
-            Text("2: [1, 3]", font_size=24),
-            Text("3: [2, 4]", font_size=24),
-            Text("4: [1, 3]", font_size=24)
-        ).arrange(DOWN, aligned_edge=LEFT)
-        adj_list_label = Text("Adjacency List", font_size=32)
+        adj_list = adjacency.build_adjacency_list(font_size=24)
+        adj_list_label = CachedText("Adjacency List", font_size=32)
         adj_list_group = VGroup(adj_list_label, adj_list).arrange(DOWN)
         
-        # Edge list representation
-        edge_list = Text("[(1,2), (2,3), (3,4), (4,1)]", font_size=24)
-        edge_list_label = Text("Edge List", font_size=32)
+        edge_list = adjacency.build_edge_list(font_size=24)
+        edge_list_label = CachedText("Edge List", font_size=32)
         edge_list_group = VGroup(edge_list_label, edge_list).arrange(DOWN)
         
         # Position all representations
@@ -140,8 +138,8 @@ class GraphRepresentationScene(Scene):
 class GraphBasics(Scene):
     def construct(self):
         # Title and definition
-        title = Text("Graph Theory Basics", font_size=48)
-        definition = Text(
+        title = CachedText("Graph Theory Basics", font_size=48)
+        definition = CachedText(
             "Graph theory is the mathematical theory of networks",
             font_size=32
         ).set_color(YELLOW)
@@ -177,7 +175,7 @@ class GraphBasics(Scene):
         social_network = VGroup(*social_edges, *person_icons)
         
         # Create clothing graph example (simplified version)
-        clothing_text = Text(
+        clothing_text = CachedText(
             "Real World Example: Clothing Combinations",
             font_size=24
         )
@@ -191,7 +189,7 @@ class GraphBasics(Scene):
         ]
         
         clothing_labels = [
-            Text(label, font_size=20).next_to(vertex, direction)
+            CachedText(label, font_size=20).next_to(vertex, direction)
             for vertex, label, direction in [
                 (clothing_vertices[0], "Hats", LEFT),
                 (clothing_vertices[2], "Shirts", UP),
@@ -248,129 +246,119 @@ class GraphBasics(Scene):
         )
         self.wait(1)
 
-class GraphTypes(Scene):
+class GraphTypes(ParametricScene):
+    params = dict(
+        ParametricScene.params,
+        title="Types of Graphs",
+        heading_color=YELLOW,
+        vertex_color=BLUE,
+        # 1. Undirected Graph Example: cities (A-F nodes with undirected edges)
+        undirected_title="Undirected Graph",
+        undirected_explanation="Cities connected by bidirectional roads",
+        city_positions={
+            'A': LEFT*3 + DOWN,
+            'B': UP,
+            'C': LEFT*2 + DOWN*0.5,
+            'D': RIGHT + UP*0.5,
+            'E': RIGHT + DOWN,
+            'F': RIGHT*3
+        },
+        city_edges=[
+            ('A','B'), ('B','C'), ('C','D'), ('D','E'),
+            ('D','F'), ('B','D'), ('C','E')
+        ],
+        # 2. Directed Graph Example: gift-giving network
+        directed_title="Directed Graph (Digraph)",
+        directed_explanation="Person u gave a gift to person v",
+        gift_positions={
+            'A': LEFT*2,
+            'B': UP + RIGHT,
+            'C': LEFT*2 + DOWN*2,
+            'D': RIGHT + DOWN,
+            'E': RIGHT*3
+        },
+        gift_edges=[
+            ('A','B'), ('B','E'), ('D','B'),
+            ('B','D'), ('C','A'), ('D','C')
+        ],
+        # 3. Weighted Graph Example: reuses the cities layout
+        weighted_title="Weighted Graph",
+        weighted_explanation="Edges represent distances/costs between nodes",
+        city_weights=[
+            ('A','B',4), ('B','C',8), ('C','D',3),
+            ('D','E',2), ('E','F',11), ('B','D',4),
+            ('C','E',9)
+        ],
+    )
+
     def construct(self):
+        params = self.params
+        
         # Title
-        title = Text("Types of Graphs", font_size=48).to_edge(UP)
+        title = self.text(params["title"], font_size=48).to_edge(UP)
         
         # 1. Undirected Graph Example
-        undirected_title = Text("Undirected Graph", font_size=36, color=YELLOW)
-        
-        # Create cities graph (A-F nodes with undirected edges)
-        cities_vertices = {
-            'A': Dot(LEFT*3 + DOWN, color=BLUE),
-            'B': Dot(UP, color=BLUE),
-            'C': Dot(LEFT*2 + DOWN*0.5, color=BLUE),
-            'D': Dot(RIGHT + UP*0.5, color=BLUE),
-            'E': Dot(RIGHT + DOWN, color=BLUE),
-            'F': Dot(RIGHT*3, color=BLUE)
-        }
+        undirected_title = self.text(
+            params["undirected_title"], font_size=36, color=params["heading_color"]
+        )
         
-        # Add labels to vertices
-        city_labels = {
-            key: Text(key, font_size=24).next_to(dot, UP*0.3)
-            for key, dot in cities_vertices.items()
-        }
-        
-        # Create undirected edges
-        undirected_edges = [
-            Line(cities_vertices[start].get_center(), 
-                 cities_vertices[end].get_center())
-            for start, end in [
-                ('A','B'), ('B','C'), ('C','D'), ('D','E'),
-                ('D','F'), ('B','D'), ('C','E')
-            ]
-        ]
+        # Create cities graph
+        city_positions = as_points(params["city_positions"])
+        cities = LectureGraph.from_named(city_positions, params["city_edges"])
         
         undirected_graph = VGroup(
-            *cities_vertices.values(),
-            *city_labels.values(),
-            *undirected_edges
+            *cities.build_vertices(color=params["vertex_color"]),
+            *cities.build_vertex_labels(**self.text_style()),
+            *cities.build_edges()
         )
         
-        undirected_explanation = Text(
-            "Cities connected by bidirectional roads",
+        undirected_explanation = self.text(
+            params["undirected_explanation"],
             font_size=24
         ).next_to(undirected_graph, DOWN)
         
         # 2. Directed Graph Example
-        directed_title = Text("Directed Graph (Digraph)", font_size=36, color=YELLOW)
+        directed_title = self.text(
+            params["directed_title"], font_size=36, color=params["heading_color"]
+        )
         
         # Create gift-giving network
-        directed_vertices = {
-            'A': Dot(LEFT*2, color=BLUE),
-            'B': Dot(UP + RIGHT, color=BLUE),
-            'C': Dot(LEFT*2 + DOWN*2, color=BLUE),
-            'D': Dot(RIGHT + DOWN, color=BLUE),
-            'E': Dot(RIGHT*3, color=BLUE)
-        }
-        
-        directed_labels = {
-            key: Text(key, font_size=24).next_to(dot, UP*0.3)
-            for key, dot in directed_vertices.items()
-        }
-        
-        # Create directed edges with arrows
-        directed_edges = [
-            Arrow(directed_vertices[start].get_center(),
-                 directed_vertices[end].get_center(),
-                 buff=0.3)
-            for start, end in [
-                ('A','B'), ('B','E'), ('D','B'),
-                ('B','D'), ('C','A'), ('D','C')
-            ]
-        ]
+        gifts = LectureGraph.from_named(
+            as_points(params["gift_positions"]),
+            params["gift_edges"],
+            directed=True
+        )
         
         directed_graph = VGroup(
-            *directed_vertices.values(),
-            *directed_labels.values(),
-            *directed_edges
+            *gifts.build_vertices(color=params["vertex_color"]),
+            *gifts.build_vertex_labels(**self.text_style()),
+            *gifts.build_edges(buff=0.3)
         )
         
-        directed_explanation = Text(
-            "Person u gave a gift to person v",
+        directed_explanation = self.text(
+            params["directed_explanation"],
             font_size=24
         )
         
         # 3. Weighted Graph Example
-        weighted_title = Text("Weighted Graph", font_size=36, color=YELLOW)
+        weighted_title = self.text(
+            params["weighted_title"], font_size=36, color=params["heading_color"]
+        )
         
         # Create weighted network (reuse cities layout)
-        weighted_vertices = {
-            key: Dot(dot.get_center(), color=BLUE)
-            for key, dot in cities_vertices.items()
-        }
-        
-        weighted_labels = {
-            key: Text(key, font_size=24).next_to(dot, UP*0.3)
-            for key, dot in weighted_vertices.items()
-        }
-        
-        # Create weighted edges with labels
-        weighted_edges = []
-        weights = [('A','B',4), ('B','C',8), ('C','D',3),
-                  ('D','E',2), ('E','F',11), ('B','D',4),
-                  ('C','E',9)]
-        
-        for start, end, weight in weights:
-            edge = Line(
-                weighted_vertices[start].get_center(),
-                weighted_vertices[end].get_center()
-            )
-            weight_label = Text(
-                str(weight),
-                font_size=24
-            ).next_to(edge.get_center(), UP, buff=0.1)
-            weighted_edges.extend([edge, weight_label])
+        weighted_cities = LectureGraph.from_named(
+            city_positions, params["city_weights"]
+        )
         
+        # Weighted edges with their labels
         weighted_graph = VGroup(
-            *weighted_vertices.values(),
-            *weighted_labels.values(),
-            *weighted_edges
+            *weighted_cities.build_vertices(color=params["vertex_color"]),
+            *weighted_cities.build_vertex_labels(**self.text_style()),
+            *weighted_cities.build_weighted_edges(text_style=self.text_style())
         )
         
-        weighted_explanation = Text(
-            "Edges represent distances/costs between nodes",
+        weighted_explanation = self.text(
+            params["weighted_explanation"],
             font_size=24
         )
         
@@ -409,28 +397,33 @@ class GraphTypes(Scene):
         # Final cleanup
         self.play(*[FadeOut(mob) for mob in self.mobjects])
 
+def shortest_path_network():
+    # Shared with the OpenGL trace player
+    return LectureGraph(
+        [
+            LEFT*3, UP, RIGHT*3,
+            DOWN*2 + LEFT, DOWN*2 + RIGHT
+        ],
+        [(0,1), (1,2), (0,3), (3,4), (4,2)]
+    )
+
 class GraphProblems(Scene):
     def construct(self):
         # Create a graph for shortest path demonstration
-        vertices = [
-            Dot(point) for point in [
-                LEFT*3, UP, RIGHT*3,
-                DOWN*2 + LEFT, DOWN*2 + RIGHT
-            ]
-        ]
-        edges = [
-            Line(vertices[i].get_center(), vertices[j].get_center())
-            for i, j in [(0,1), (1,2), (0,3), (3,4), (4,2)]
-        ]
+        network = shortest_path_network()
+        vertices = network.build_vertices()
+        edges = network.build_edges()
         graph = VGroup(*vertices, *edges)
         
-        # Highlight shortest path
-        path_edges = [edges[0], edges[1]]  # Example path
+        # Run Dijkstra from the left vertex and highlight the path it finds
+        search = Trace()
+        _, parent_edge = dijkstra(network, 0, target=2, trace=search)
+        path_edges = [edges[i] for i in path_edge_ids(network, parent_edge, 2)]
         highlighted_path = VGroup(*path_edges).copy().set_color(YELLOW)
         
         # Title and explanation
-        title = Text("Common Graph Problems", font_size=40)
-        subtitle = Text("Shortest Path", font_size=32)
+        title = CachedText("Common Graph Problems", font_size=40)
+        subtitle = CachedText("Shortest Path", font_size=32)
         
         # Position elements
         title.to_edge(UP)
@@ -442,38 +435,81 @@ class GraphProblems(Scene):
         self.play(Write(subtitle))
         self.play(Create(graph))
         self.wait()
+        play_trace(
+            self, trace_animations(search, vertices, edges), step_time=0.5,
+            num_steps=search.count((POP,)),
+        )
         self.play(Create(highlighted_path))
         self.wait(2)
 
-class ShortestPathAlgorithms(Scene):
-    def construct(self):
-        title = Text("Shortest Path Algorithms", font_size=48).to_edge(UP)
-        
-        # Create a weighted graph for demonstration
-        vertices = [Dot(point) for point in [
+# Road networks with more edges than this are drawn as one EdgeBundle and
+# one GlyphBundle of weights instead of a Line and a Text per edge
+BUNDLE_EDGES = 200
+
+class ShortestPathAlgorithms(ParametricScene):
+    params = dict(
+        ParametricScene.params,
+        title="Shortest Path Algorithms",
+        # Weighted graph for demonstration, routed from source to target
+        road_positions=[
             LEFT*4, LEFT*2, ORIGIN, RIGHT*2, RIGHT*4,
             DOWN*2 + LEFT*3, DOWN*2 + RIGHT*3
-        ]]
-        
-        edges = []
-        weights = [(0,1,4), (1,2,3), (2,3,2), (3,4,1),
-                  (0,5,2), (5,6,5), (6,4,3), (1,6,6)]
+        ],
+        road_weights=[
+            (0,1,4), (1,2,3), (2,3,2), (3,4,1),
+            (0,5,2), (5,6,5), (6,4,3), (1,6,6)
+        ],
+        source=0,
+        target=4,
+        route_color=GREEN,
+        # Algorithms list, as (text, color)
+        algorithms=[
+            ("• BFS (unweighted)", BLUE),
+            ("• Dijkstra's Algorithm", GREEN),
+            ("• Bellman-Ford", RED),
+            ("• Floyd-Warshall", YELLOW),
+            ("• A* Algorithm", PURPLE)
+        ],
+    )
+
+    def construct(self):
+        params = self.params
+        title = self.text(params["title"], font_size=48).to_edge(UP)
         
-        for start, end, weight in weights:
-            edge = Line(vertices[start].get_center(), vertices[end].get_center())
-            weight_label = Text(str(weight), font_size=24).next_to(edge.get_center(), UP, buff=0.1)
-            edges.extend([edge, weight_label])
+        # Create a weighted graph for demonstration
+        roads = LectureGraph(
+            [as_point(point) for point in params["road_positions"]],
+            params["road_weights"]
+        )
         
-        graph = VGroup(*vertices, *edges)
+        # Dijkstra's route over the same weighted edge list
+        target = params["target"]
+        _, parent_edge = dijkstra(roads, params["source"], target=target)
+        route_ids = path_edge_ids(roads, parent_edge, target)
+        
+        if roads.num_edges > BUNDLE_EDGES:
+            # The route is drawn over the bundle so it can change colour alone
+            starts, ends = roads.endpoints()
+            route = EdgeBundle(starts[route_ids], ends[route_ids])
+            graph = VGroup(
+                *roads.build_vertices(),
+                roads.build_edge_bundle(),
+                route,
+                roads.build_weight_bundle(text_style=self.text_style())
+            )
+        else:
+            road_edges = roads.build_edges()
+            route = VGroup(*[road_edges[i] for i in route_ids])
+            graph = VGroup(
+                *roads.build_vertices(),
+                *interleave(road_edges, roads.build_weight_labels(**self.text_style()))
+            )
         
         # Algorithms list
-        algorithms = VGroup(
-            Text("• BFS (unweighted)", font_size=32, color=BLUE),
-            Text("• Dijkstra's Algorithm", font_size=32, color=GREEN),
-            Text("• Bellman-Ford", font_size=32, color=RED),
-            Text("• Floyd-Warshall", font_size=32, color=YELLOW),
-            Text("• A* Algorithm", font_size=32, color=PURPLE)
-        ).arrange(DOWN, aligned_edge=LEFT, buff=0.3)
+        algorithms = VGroup(*[
+            self.text(text, font_size=32, color=color)
+            for text, color in params["algorithms"]
+        ]).arrange(DOWN, aligned_edge=LEFT, buff=0.3)
         
         # Animation sequence
         self.play(Write(title))
@@ -485,75 +521,100 @@ class ShortestPathAlgorithms(Scene):
             graph.animate.scale(0.7).to_edge(LEFT),
             LaggedStartMap(FadeIn, algorithms.to_edge(RIGHT), lag_ratio=0.3)
         )
+        self.play(route.animate.set_color(params["route_color"]))
         self.wait(2)
         self.play(*[FadeOut(mob) for mob in self.mobjects])
 
+def max_flow_network():
+    # Source, sink, then the middle vertices
+    return LectureGraph(
+        [LEFT*4, RIGHT*4, LEFT*2, RIGHT*2, UP*2, DOWN*2],
+        [(0, 2), (0, 4), (2, 3), (4, 3), (3, 1)],
+        capacities=[10, 7, 8, 4, 12],
+        directed=True
+    )
+
 class ConnectivityAndFlow(Scene):
     def construct(self):
-        title = Text("Network Flow & Connectivity", font_size=48).to_edge(UP)
+        title = CachedText("Network Flow & Connectivity", font_size=48).to_edge(UP)
         
         # Create a flow network
-        source = Dot(LEFT*4, color=GREEN)
-        sink = Dot(RIGHT*4, color=RED)
-        mid_vertices = [Dot(point) for point in [LEFT*2, RIGHT*2, UP*2, DOWN*2]]
+        flow_network = max_flow_network()
         
-        # Create edges with capacities
-        edges = []
-        flow_values = [(source, mid_vertices[0], "5/10"),
-                      (source, mid_vertices[2], "3/7"),
-                      (mid_vertices[0], mid_vertices[1], "4/8"),
-                      (mid_vertices[2], mid_vertices[1], "2/4"),
-                      (mid_vertices[1], sink, "6/12")]
+        # Create edges with flow/capacity labels, starting from zero flow
+        arrows = flow_network.build_edges(buff=0.3)
+        cap_labels = FlowLabels(
+            flow_network, [arrow.get_top() for arrow in arrows]
+        )
         
-        for start, end, capacity in flow_values:
-            arrow = Arrow(start.get_center(), end.get_center(), buff=0.3)
-            cap_label = Text(capacity, font_size=24).next_to(arrow, UP, buff=0.1)
-            edges.extend([arrow, cap_label])
+        network = VGroup(
+            *flow_network.build_vertices(color=[GREEN, RED] + [WHITE]*4),
+            *interleave(arrows, cap_labels.labels)
+        )
         
-        network = VGroup(source, sink, *mid_vertices, *edges)
+        # Bridges of the underlying undirected network
+        bridges = VGroup(*[arrows[i] for i in find_bridges(flow_network)])
         
         # Topics to cover
         topics = VGroup(
-            Text("Maximum Flow:", font_size=36),
-            Text("• Ford-Fulkerson Algorithm", font_size=28),
-            Text("• Edmonds-Karp Algorithm", font_size=28),
-            Text("\nConnectivity:", font_size=36),
-            Text("• Union-Find DS", font_size=28),
-            Text("• Bridge Detection", font_size=28)
+            CachedText("Maximum Flow:", font_size=36),
+            CachedText("• Ford-Fulkerson Algorithm", font_size=28),
+            CachedText("• Edmonds-Karp Algorithm", font_size=28),
+            CachedText("\nConnectivity:", font_size=36),
+            CachedText("• Union-Find DS", font_size=28),
+            CachedText("• Bridge Detection", font_size=28)
         ).arrange(DOWN, aligned_edge=LEFT)
         
         # Animation
         self.play(Write(title))
         self.play(Create(network))
         self.wait(1)
+        
+        # Edmonds-Karp: push flow along each shortest augmenting path
+        play_trace(self, (
+            [
+                *[Indicate(arrows[i], scale_factor=1) for i in path],
+                *cap_labels.update(path, flow)
+            ]
+            for path, _, flow in augmenting_paths(flow_network, 0, 1)
+        ), step_time=1)
+        self.wait(1)
         self.play(
             network.animate.scale(0.7).to_edge(LEFT),
             Write(topics.to_edge(RIGHT))
         )
+        
+        # Union-find: edges joining two components form a spanning forest,
+        # the rest close a cycle
+        play_trace(self, (
+            arrows[edge_id].animate.set_color(BLUE if merged else GRAY)
+            for edge_id, merged in union_steps(flow_network)
+        ), step_time=0.5, num_steps=flow_network.num_edges)
+        self.play(bridges.animate.set_color(RED))
         self.wait(2)
         self.play(*[FadeOut(mob) for mob in self.mobjects])
 
 class RealWorldApplications(Scene):
     def construct(self):
-        title = Text("Real World Applications", font_size=48).to_edge(UP)
+        title = CachedText("Real World Applications", font_size=48).to_edge(UP)
         
         # Create application examples with icons and descriptions
         applications = VGroup(
             VGroup(
-                Text("🗺️ Navigation", font_size=36),
-                Text("Shortest path in road networks", font_size=24)
+                CachedText("🗺️ Navigation", font_size=36),
+                CachedText("Shortest path in road networks", font_size=24)
             ).arrange(DOWN),
             VGroup(
-                Text("🌐 Social Networks", font_size=36),
-                Text("Friend recommendations", font_size=24)
+                CachedText("🌐 Social Networks", font_size=36),
+                CachedText("Friend recommendations", font_size=24)
             ).arrange(DOWN),
             VGroup(
-                Text("💻 Computer Networks", font_size=36),
-                Text("Routing and bandwidth", font_size=24)
+                CachedText("💻 Computer Networks", font_size=36),
+                CachedText("Routing and bandwidth", font_size=24)
             ).arrange(DOWN),
             VGroup(
-                Text("🏭 Supply Chain", font_size=36),
-                Text("Resource allocation", font_size=24)
+                CachedText("🏭 Supply Chain", font_size=36),
+                CachedText("Resource allocation", font_size=24)
             ).arrange(DOWN)
         ).arrange(DOWN, buff=0.8, aligned_edge=LEFT)
         
@@ -564,7 +625,7 @@ class RealWorldApplications(Scene):
         self.wait(2)
         
         # Final message
-        final_message = Text(
+        final_message = CachedText(
             "Graph Theory: A powerful tool for solving real-world problems",
             font_size=36,
             color=YELLOW
@@ -574,25 +635,89 @@ class RealWorldApplications(Scene):
         self.wait(2)
         self.play(*[FadeOut(mob) for mob in self.mobjects])
 
-class CompletePresentation(Scene):
+# Sections of the full deck, in presentation order
+PRESENTATION_SECTIONS = [
+    IntroScene,                # Introduction
+    GraphBasics,               # Basic Concepts
+    GraphTypesOverview,        # Types of Graphs
+    GraphRepresentationScene,  # Graph Representation
+    ShortestPathAlgorithms,    # Algorithms and Problems
+    ConnectivityAndFlow,       # Network Flow and Connectivity
+    RealWorldApplications,     # Real World Applications
+]
+
+def presentation_start(value=None):
+    # First section to build, as an index or a scene name, e.g.
+    #   PRESENTATION_START=ConnectivityAndFlow manim graph_theory_presentation.py CompletePresentation
+    if value is None:
+        value = os.environ.get("PRESENTATION_START", "0")
+    names = [section.__name__ for section in PRESENTATION_SECTIONS]
+    if value in names:
+        return names.index(value)
+    try:
+        index = int(value)
+    except ValueError:
+        raise ValueError(
+            f"unknown presentation section {value!r}; expected an index or "
+            f"one of {', '.join(names)}"
+        ) from None
+    if not 0 <= index < len(names):
+        raise ValueError(
+            f"presentation section index {index} out of range 0..{len(names) - 1}"
+        )
+    return index
+
+class CompletePresentation(ParametricScene):
+    # Each section is built only when it is reached and released once its
+    # closing FadeOut has played, so memory does not grow with the deck.
+    # Sections before the start are never built at all. A variant's font
+    # applies to every parametric section; a section's own parameters are
+    # given under its name:
+    #
+    #   CompletePresentation.variant(
+    #       "es", ShortestPathAlgorithms={"title": "Caminos más cortos"}
+    #   )
+    start_section = None
+    params = dict(
+        ParametricScene.params,
+        **{
+            section.__name__: {} for section in PRESENTATION_SECTIONS
+            if issubclass(section, ParametricScene)
+        },
+    )
+
+    @classmethod
+    def variant(cls, name, **params):
+        variant = super().variant(name, **params)
+        for section in PRESENTATION_SECTIONS:
+            if section.__name__ in params:
+                section.variant(name, **params[section.__name__])
+        return variant
+
+    def section_params(self, section):
+        # The section's parameters under this variant's overrides
+        deck_params = type(self).params
+        if not issubclass(section, ParametricScene):
+            return ParametricScene.params
+        overrides = {
+            key: deck_params[key] for key, default in ParametricScene.params.items()
+            if deck_params[key] != default
+        }
+        overrides.update(deck_params.get(section.__name__, {}))
+        return {**section.params, **overrides}
+
     def construct(self):
-        # Introduction
-        IntroScene.construct(self)
-        
-        # Basic Concepts
-        GraphBasics.construct(self)
-        
-        # Types of Graphs
-        GraphTypesOverview.construct(self)
-        
-        # Graph Representation
-        GraphRepresentationScene.construct(self)
-        
-        # Algorithms and Problems
-        ShortestPathAlgorithms.construct(self)
-        
-        # Network Flow and Connectivity
-        ConnectivityAndFlow.construct(self)
-        
-        # Real World Applications
-        RealWorldApplications.construct(self) 
\ No newline at end of file
+        for section in PRESENTATION_SECTIONS[presentation_start(self.start_section):]:
+            self.next_section(section.__name__)
+            self.params = self.section_params(section)
+            section.construct(self)
+            self.release_section()
+
+    def release_section(self):
+        # Drop the scene's own references to the finished section (what is
+        # left on screen and the last animations played) and collect them
+        self.clear()
+        self.foreground_mobjects = []
+        self.moving_mobjects = []
+        self.animations = None
+        gc.collect()
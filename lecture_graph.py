@@ -0,0 +1,226 @@
+import numpy as np
+from manim import (
+    DEFAULT_DOT_RADIUS, MED_SMALL_BUFF, UP, WHITE, Arrow, Dot, Line, VGroup,
+    VMobject,
+)
+from scipy.sparse import csr_array
+
+from text_cache import CachedText
+
+# One graph model for every lecture scene. Vertices and edges live in flat
+# NumPy arrays (positions, edge index pairs, weights, capacities); the Dots,
+# Lines/Arrows and labels are generated from them in one pass instead of
+# being wired up by hand from parallel lists in each construct().
+
+
+def interleave(*groups):
+    # [e0, l0, e1, l1, ...] so Create draws each label right after its edge
+    return [mob for members in zip(*groups) for mob in members]
+
+
+def subpath_splits(vmobject, points):
+    # Vectorized VMobject.gen_subpaths_from_points_2d: a new subpath starts
+    # wherever a curve does not begin where the previous one ended. Returns
+    # the subpath boundaries as point indices, including 0 and len(points).
+    nppcc = vmobject.n_points_per_cubic_curve
+    ends = points[nppcc - 1:-1:nppcc, :2]
+    starts = points[nppcc::nppcc, :2]
+    tolerance = vmobject.tolerance_for_point_equality + 1e-5 * np.abs(starts)
+    breaks = np.any(np.abs(ends - starts) > tolerance, axis=1)
+    return np.concatenate((
+        [0], (np.flatnonzero(breaks) + 1) * nppcc, [len(points)]
+    ))
+
+
+def _bundle_subpaths(vmobject, points):
+    split_indices = subpath_splits(vmobject, points)
+    return (
+        points[i1:i2]
+        for i1, i2 in zip(split_indices[:-1], split_indices[1:])
+        if i2 - i1 >= vmobject.n_points_per_cubic_curve
+    )
+
+
+class EdgeBundle(VMobject):
+    # All edges of a graph as one VMobject: every straight edge is a single
+    # cubic curve in one shared point array, so moving, partially creating
+    # and drawing the whole edge set are single array operations instead of
+    # one Line per edge.
+    def __init__(self, starts, ends, **kwargs):
+        super().__init__(**kwargs)
+        self.set_segments(starts, ends)
+
+    def set_segments(self, starts, ends):
+        starts = np.asarray(starts, dtype=float).reshape(-1, 3)
+        ends = np.asarray(ends, dtype=float).reshape(-1, 3)
+        alphas = np.linspace(0, 1, self.n_points_per_cubic_curve)[None, :, None]
+        points = starts[:, None, :] + alphas * (ends - starts)[:, None, :]
+        self.points = points.reshape(-1, 3)
+        return self
+
+    def gen_subpaths_from_points_2d(self, points):
+        return _bundle_subpaths(self, points)
+
+
+class GlyphBundle(VMobject):
+    # Many short labels as one filled VMobject. Each distinct string is laid
+    # out once and its glyph outlines are stamped at every anchor with a
+    # single broadcast add. Labels sit ``buff`` away from their anchor in
+    # ``direction``; ORIGIN centers them on it.
+    def __init__(self, texts, anchors, font_size=24, buff=0.1,
+                 color=WHITE, direction=UP, text_style=None, **kwargs):
+        super().__init__(
+            fill_color=color, fill_opacity=1.0, stroke_width=0, **kwargs
+        )
+        texts = list(texts)
+        anchors = np.asarray(anchors, dtype=float).reshape(-1, 3)
+        text_indices = {}
+        for i, text in enumerate(texts):
+            text_indices.setdefault(text, []).append(i)
+
+        stamped = []
+        for text, indices in text_indices.items():
+            template = CachedText(text, font_size=font_size, **(text_style or {}))
+            outline = np.concatenate([
+                glyph.points for glyph in template.family_members_with_points()
+            ])
+            offsets = anchors[indices] + direction * buff
+            offsets -= template.get_critical_point(-direction)
+            stamped.append(
+                (outline[None, :, :] + offsets[:, None, :]).reshape(-1, 3)
+            )
+        if stamped:
+            self.points = np.concatenate(stamped)
+
+    def gen_subpaths_from_points_2d(self, points):
+        return _bundle_subpaths(self, points)
+
+
+class LectureGraph:
+    def __init__(self, positions, edges, weights=None, capacities=None,
+                 labels=None, directed=False):
+        self.positions = np.asarray(positions, dtype=float).reshape(-1, 3)
+        edges = np.asarray(edges)
+        if edges.size == 0:
+            edges = edges.reshape(0, 2)
+        if edges.shape[1] == 3 and weights is None:
+            weights = edges[:, 2]
+        self.edges = edges[:, :2].astype(np.int32)
+        self.weights = None if weights is None else np.asarray(weights)
+        self.capacities = None if capacities is None else np.asarray(capacities)
+        self.labels = labels
+        self.directed = directed
+
+    @classmethod
+    def from_named(cls, named_positions, edges, **kwargs):
+        # {'A': point, ...} plus ('A', 'B') or ('A', 'B', weight) tuples
+        labels = list(named_positions)
+        index = {label: i for i, label in enumerate(labels)}
+        edges = list(edges)
+        pairs = [(index[edge[0]], index[edge[1]]) for edge in edges]
+        if edges and len(edges[0]) == 3:
+            kwargs.setdefault("weights", [edge[2] for edge in edges])
+        return cls(
+            list(named_positions.values()), pairs, labels=labels, **kwargs
+        )
+
+    @property
+    def num_vertices(self):
+        return len(self.positions)
+
+    @property
+    def num_edges(self):
+        return len(self.edges)
+
+    def endpoints(self):
+        return self.positions[self.edges[:, 0]], self.positions[self.edges[:, 1]]
+
+    def midpoints(self):
+        starts, ends = self.endpoints()
+        return (starts + ends) / 2
+
+    def adjacency(self, sparse=False):
+        # Edge weights (1 when unweighted) at [u, v], mirrored when undirected
+        n = self.num_vertices
+        rows, cols = self.edges[:, 0], self.edges[:, 1]
+        values = np.ones(self.num_edges) if self.weights is None else self.weights
+        if not self.directed:
+            rows, cols = np.concatenate((rows, cols)), np.concatenate((cols, rows))
+            values = np.concatenate((values, values))
+        if sparse:
+            return csr_array((values, (rows, cols)), shape=(n, n))
+        matrix = np.zeros((n, n))
+        matrix[rows, cols] = values
+        return matrix
+
+    def build_vertices(self, color=WHITE, **kwargs):
+        colors = color if isinstance(color, (list, tuple)) else [color] * self.num_vertices
+        return VGroup(*[
+            Dot(point, color=vertex_color, **kwargs)
+            for point, vertex_color in zip(self.positions, colors)
+        ])
+
+    def build_edges(self, **kwargs):
+        edge_class = Arrow if self.directed else Line
+        return VGroup(*[
+            edge_class(start, end, **kwargs)
+            for start, end in zip(*self.endpoints())
+        ])
+
+    def build_edge_bundle(self, **kwargs):
+        # Straight, undirected edges only; arrows keep their own tips
+        return EdgeBundle(*self.endpoints(), **kwargs)
+
+    def build_weight_bundle(self, font_size=24, buff=0.1, **kwargs):
+        return GlyphBundle(
+            [str(weight) for weight in self.weights.tolist()],
+            self.midpoints(),
+            font_size=font_size,
+            buff=buff,
+            **kwargs,
+        )
+
+    def build_labels(self, texts, anchors, font_size=24, buff=0.1, **kwargs):
+        # Each distinct string is laid out once; every label is then a copy
+        # shifted so its bottom edge sits ``buff`` above its anchor.
+        templates = {}
+        for text in set(texts):
+            template = CachedText(text, font_size=font_size, **kwargs)
+            templates[text] = (template, template.get_center(), template.height)
+        anchors = np.asarray(anchors, dtype=float).reshape(-1, 3)
+
+        labels = []
+        for text, anchor in zip(texts, anchors):
+            template, center, height = templates[text]
+            target = anchor + UP * (buff + height / 2)
+            labels.append(template.copy().shift(target - center))
+        return VGroup(*labels)
+
+    def build_vertex_labels(self, font_size=24, buff=MED_SMALL_BUFF * 0.3,
+                            **kwargs):
+        # Same placement as ``Text(label).next_to(dot, UP*0.3)``
+        return self.build_labels(
+            [str(label) for label in self.labels],
+            self.positions + UP * DEFAULT_DOT_RADIUS,
+            font_size=font_size,
+            buff=buff,
+            **kwargs,
+        )
+
+    def build_weight_labels(self, font_size=24, buff=0.1, **kwargs):
+        return self.build_labels(
+            [str(weight) for weight in self.weights.tolist()],
+            self.midpoints(),
+            font_size=font_size,
+            buff=buff,
+            **kwargs,
+        )
+
+    def build_weighted_edges(self, font_size=24, buff=0.1, text_style=None,
+                             **kwargs):
+        return VGroup(*interleave(
+            self.build_edges(**kwargs),
+            self.build_weight_labels(
+                font_size=font_size, buff=buff, **(text_style or {})
+            ),
+        ))
@@ -0,0 +1,135 @@
+import numpy as np
+from manim import MarkupText, SingleStringMathTex, Text
+from manim.camera.camera import Camera
+
+from lecture_graph import EdgeBundle, GlyphBundle, subpath_splits
+
+# Level-of-detail Cairo camera. Before each frame it drops what cannot show
+# up in it: mobjects entirely outside the frame, anything smaller than a
+# pixel, and labels whose text would be too small to read. Edge bundles
+# whose edges are only a few pixels long are not stroked through Cairo at
+# all; their segments are sampled and splatted straight into the frame's
+# pixel array, so their cost follows the number of pixels they cover rather
+# than Cairo's per-curve path setup.
+#
+#   scene = GraphTypes(renderer=CairoRenderer(camera_class=LODCamera))
+
+LABEL_TYPES = (Text, MarkupText, SingleStringMathTex)
+
+
+class LODCamera(Camera):
+    min_pixels = 0.5
+    min_label_pixels = 4
+    raster_edge_pixels = 3
+
+    def pixels_per_unit(self):
+        return self.pixel_width / self.frame_width
+
+    def frame_bounds(self):
+        center = self.frame_center
+        half = np.array([self.frame_width, self.frame_height]) / 2
+        return center[:2] - half, center[:2] + half
+
+    def _glyph_pixels(self, bundle):
+        # Typical glyph height of a GlyphBundle: the median outline height,
+        # which holds up under scaling and while the bundle is being created
+        points = bundle.points
+        if len(points) == 0:
+            return 0.0
+        starts = subpath_splits(bundle, points)[:-1]
+        heights = (
+            np.maximum.reduceat(points[:, 1], starts)
+            - np.minimum.reduceat(points[:, 1], starts)
+        )
+        return float(np.median(heights)) * self.pixels_per_unit()
+
+    def _label_pixels(self, mobject):
+        if isinstance(mobject, GlyphBundle):
+            return self._glyph_pixels(mobject)
+        if isinstance(mobject, LABEL_TYPES):
+            points = mobject.get_all_points()
+            if len(points):
+                return np.ptp(points[:, 1]) * self.pixels_per_unit()
+        return None
+
+    def _collect_culled(self, mobject, lower, upper, culled):
+        label_pixels = self._label_pixels(mobject)
+        if label_pixels is not None and label_pixels < self.min_label_pixels:
+            culled.update(id(member) for member in mobject.get_family())
+            return
+        points = mobject.points
+        if len(points):
+            scale = self.pixels_per_unit()
+            low, high = points[:, :2].min(axis=0), points[:, :2].max(axis=0)
+            stroke_width = getattr(mobject, "stroke_width", 0) or 0
+            margin = stroke_width * self.cairo_line_width_multiple
+            outside = np.any(high + margin < lower) or np.any(low - margin > upper)
+            tiny = (np.hypot(*(high - low)) + 2 * margin) * scale < self.min_pixels
+            if outside or tiny:
+                culled.add(id(mobject))
+        for submobject in mobject.submobjects:
+            self._collect_culled(submobject, lower, upper, culled)
+
+    def get_mobjects_to_display(self, mobjects, include_submobjects=True,
+                                excluded_mobjects=None):
+        mobjects = list(mobjects)
+        displayed = super().get_mobjects_to_display(
+            mobjects, include_submobjects, excluded_mobjects
+        )
+        culled = set()
+        lower, upper = self.frame_bounds()
+        for mobject in mobjects:
+            self._collect_culled(mobject, lower, upper, culled)
+        return [mobject for mobject in displayed if id(mobject) not in culled]
+
+    def _edge_pixels(self, bundle):
+        nppcc = bundle.n_points_per_cubic_curve
+        segments = bundle.points.reshape(-1, nppcc, 3)
+        lengths = np.linalg.norm(segments[:, -1, :2] - segments[:, 0, :2], axis=1)
+        return lengths * self.pixels_per_unit()
+
+    def _splat_bundle(self, bundle, lengths, pixel_array):
+        # Each edge is sampled about once per pixel of its length; a pixel's
+        # coverage is the line area of the samples falling into it
+        nppcc = bundle.n_points_per_cubic_curve
+        segments = bundle.points.reshape(-1, nppcc, 3)
+        starts, ends = segments[:, 0, :2], segments[:, -1, :2]
+        counts = np.maximum(np.ceil(lengths), 1).astype(np.int64)
+        owners = np.repeat(np.arange(len(counts)), counts)
+        first = np.cumsum(counts) - counts
+        t = ((np.arange(len(owners)) - first[owners] + 0.5) / counts[owners])[:, None]
+        points = starts[owners] + t * (ends - starts)[owners]
+
+        scale = self.pixels_per_unit()
+        center = self.frame_center
+        x = (points[:, 0] - center[0]) * scale + self.pixel_width / 2
+        y = self.pixel_height / 2 - (points[:, 1] - center[1]) * scale
+        inside = (x >= 0) & (x < self.pixel_width) & (y >= 0) & (y < self.pixel_height)
+        width = bundle.get_stroke_width() * self.cairo_line_width_multiple * scale
+        area = (lengths / counts * width)[owners][inside]
+        cells = y[inside].astype(np.int64) * self.pixel_width + x[inside].astype(np.int64)
+        coverage = np.bincount(cells, area, minlength=self.pixel_height * self.pixel_width)
+
+        rgba = bundle.get_stroke_rgbas()[0]
+        alpha = np.minimum(coverage, 1.0).reshape(self.pixel_height, self.pixel_width)
+        alpha = (alpha * rgba[3])[..., None]
+        touched = alpha[..., 0] > 0
+        source = np.append(rgba[:3], 1.0) * 255
+        frame = pixel_array[touched].astype(np.float64)
+        pixel_array[touched] = (
+            source * alpha[touched] + frame * (1 - alpha[touched]) + 0.5
+        ).astype(np.uint8)
+
+    def display_multiple_non_background_colored_vmobjects(self, vmobjects,
+                                                          pixel_array):
+        ctx = self.get_cairo_context(pixel_array)
+        for vmobject in vmobjects:
+            if isinstance(vmobject, EdgeBundle) and len(vmobject.points):
+                lengths = self._edge_pixels(vmobject)
+                if lengths.mean() < self.raster_edge_pixels:
+                    surface = ctx.get_target()
+                    surface.flush()
+                    self._splat_bundle(vmobject, lengths, pixel_array)
+                    surface.mark_dirty()
+                    continue
+            self.display_vectorized(vmobject, ctx)
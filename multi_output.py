@@ -0,0 +1,168 @@
+import argparse
+import math
+
+import numpy as np
+from manim import logger, tempconfig
+from manim.camera.camera import Camera
+from manim.constants import QUALITIES
+from manim.renderer.cairo_renderer import CairoRenderer
+from manim.utils.iterables import list_update
+
+import graph_theory_presentation as deck
+from frame_pipe import MovieStream, stream_settings
+from lod_camera import LODCamera
+from render_farm import output_path, quality_settings, render_config
+
+# Several qualities of one scene from a single pass over its animations.
+# The scene renders normally at the highest frame rate asked for; every time
+# a frame is added, the other targets rasterize the same mobjects with their
+# own camera at their own size. A target at a lower frame rate is a
+# subsample of that timeline (480p15 takes every 4th frame of a 60 fps
+# render), so it only rasterizes the frames it keeps:
+#
+#   python multi_output.py GraphTypes -q low_quality -q high_quality -q fourk_quality
+#
+# Every target lands where a plain render at that quality would put it.
+# Partial movie caching is off for these renders: a cached animation is
+# skipped without being evaluated, and the other targets need its frames.
+
+
+class VideoTarget:
+    # One extra output: a camera at its own size and a movie at its own rate
+    def __init__(self, quality, scene_name, camera_class=Camera):
+        settings = quality_settings(quality)
+        self.quality = quality
+        self.frame_rate = settings["frame_rate"]
+        self.camera = camera_class(
+            pixel_width=settings["pixel_width"],
+            pixel_height=settings["pixel_height"],
+            frame_rate=self.frame_rate,
+        )
+        self.path = output_path(quality, scene_name)
+        self.settings = stream_settings(
+            width=settings["pixel_width"], height=settings["pixel_height"],
+            frame_rate=self.frame_rate,
+        )
+        self.frames = 0
+        self.movie = None
+
+    def owed(self, source_frames, source_rate):
+        # Frame k of this target is source frame ceil(k * source_rate / rate)
+        return math.ceil(source_frames * self.frame_rate / source_rate - 1e-9) \
+            - self.frames
+
+    def open(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.movie = MovieStream(self.path, self.settings)
+
+    def write(self, mobjects, num_frames):
+        self.camera.reset()
+        self.camera.capture_mobjects(mobjects)
+        image = self.camera.pixel_array
+        if self.movie.last is not None and np.array_equal(self.movie.last, image):
+            # Unchanged: extend the previous frame's run
+            self.movie.extend(num_frames)
+        else:
+            self.movie.write(image.copy(), num_frames)
+        self.frames += num_frames
+
+    def close(self):
+        if self.movie is None:
+            return
+        self.movie.close()
+        self.movie = None
+        logger.info(f"{self.quality}: {self.frames} frames written to {self.path}")
+
+
+class MultiOutputRenderer(CairoRenderer):
+    def __init__(self, qualities=(), **kwargs):
+        super().__init__(**kwargs)
+        self.qualities = list(qualities)
+        self.targets = []
+        self.source_frames = 0
+
+    def init_scene(self, scene):
+        super().init_scene(scene)
+        self.scene = scene
+        self.targets = [
+            VideoTarget(quality, scene.__class__.__name__, self.camera.__class__)
+            for quality in self.qualities
+        ]
+        for target in self.targets:
+            if self.camera.frame_rate % target.frame_rate:
+                logger.warning(
+                    f"{target.quality}: {target.frame_rate:g} fps does not divide "
+                    f"{self.camera.frame_rate:g} fps, frames will be spaced unevenly"
+                )
+            target.open()
+
+    def add_frame(self, frame, num_frames=1):
+        super().add_frame(frame, num_frames)
+        if self.skip_animations:
+            return
+        self.source_frames += num_frames
+        mobjects = None
+        for target in self.targets:
+            owed = target.owed(self.source_frames, self.camera.frame_rate)
+            if owed > 0:
+                if mobjects is None:
+                    mobjects = list_update(
+                        self.scene.mobjects, self.scene.foreground_mobjects
+                    )
+                target.write(mobjects, owed)
+
+    def scene_finished(self, scene):
+        super().scene_finished(scene)
+        for target in self.targets:
+            target.close()
+
+
+def primary_quality(qualities):
+    # The one rendered through manim: highest frame rate, then largest size
+    return max(qualities, key=lambda quality: (
+        QUALITIES[quality]["frame_rate"], QUALITIES[quality]["pixel_height"]
+    ))
+
+
+def render_variants(scene_name, qualities, lod=False):
+    qualities = list(dict.fromkeys(qualities))
+    primary = primary_quality(qualities)
+    settings = render_config(primary)
+    settings["disable_caching"] = True
+    with tempconfig(settings):
+        renderer_kwargs = {"qualities": [q for q in qualities if q != primary]}
+        if lod:
+            renderer_kwargs["camera_class"] = LODCamera
+        scene = getattr(deck, scene_name)(
+            renderer=MultiOutputRenderer(**renderer_kwargs)
+        )
+        scene.render()
+        movies = {primary: str(scene.renderer.file_writer.movie_file_path)}
+        movies.update(
+            (target.quality, str(target.path)) for target in scene.renderer.targets
+        )
+    return movies
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Render a scene at several qualities in one pass"
+    )
+    parser.add_argument("scenes", nargs="+")
+    parser.add_argument(
+        "-q", "--quality", action="append", choices=sorted(QUALITIES),
+        help="repeat for each output (default: low, high and 4k)"
+    )
+    parser.add_argument(
+        "--lod", action="store_true", help="render with the LOD camera"
+    )
+    args = parser.parse_args()
+
+    qualities = args.quality or ["low_quality", "high_quality", "fourk_quality"]
+    for name in args.scenes:
+        for quality, movie in render_variants(name, qualities, args.lod).items():
+            print(f"{name} {quality}: {movie}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+from collections import deque
+
+import numpy as np
+from manim import UP, Transform
+
+from text_cache import CachedText
+
+# Flow and connectivity algorithms for ConnectivityAndFlow: Edmonds-Karp max
+# flow, union-find and bridge finding, all working on LectureGraph arrays.
+# Max flow is a generator that yields after every augmenting path, so a
+# scene can stream the updates into its existing capacity labels.
+
+
+def augmenting_paths(graph, source, sink):
+    # Residual arcs: 2*e is edge e forwards, 2*e + 1 its reverse. Yields
+    # (edge_ids, amount, flow) after each shortest augmenting path; ``flow``
+    # is the live per-edge flow array.
+    tails = graph.edges.reshape(-1)
+    heads = graph.edges[:, ::-1].reshape(-1)
+    residual = np.zeros(2 * graph.num_edges)
+    residual[0::2] = graph.capacities
+    if not graph.directed:
+        residual[1::2] = graph.capacities
+    flow = np.zeros(graph.num_edges)
+
+    order = np.argsort(tails, kind="stable")
+    indptr = np.zeros(graph.num_vertices + 1, dtype=np.int64)
+    np.cumsum(np.bincount(tails, minlength=graph.num_vertices), out=indptr[1:])
+    indptr, order, heads = indptr.tolist(), order.tolist(), heads.tolist()
+
+    while True:
+        parent_arc = [-1] * graph.num_vertices
+        parent_arc[source] = -2
+        queue = deque([source])
+        while queue and parent_arc[sink] == -1:
+            u = queue.popleft()
+            for arc in order[indptr[u]:indptr[u + 1]]:
+                v = heads[arc]
+                if parent_arc[v] == -1 and residual[arc] > 0:
+                    parent_arc[v] = arc
+                    queue.append(v)
+        if parent_arc[sink] == -1:
+            return
+
+        arcs = []
+        vertex = sink
+        while vertex != source:
+            arc = parent_arc[vertex]
+            arcs.append(arc)
+            vertex = tails[arc]
+        arcs = np.array(arcs[::-1])
+
+        amount = residual[arcs].min()
+        residual[arcs] -= amount
+        residual[arcs ^ 1] += amount
+        edge_ids = arcs >> 1
+        flow[edge_ids] += np.where(arcs & 1, -amount, amount)
+        yield edge_ids.tolist(), amount, flow
+
+
+def max_flow(graph, source, sink):
+    flow = np.zeros(graph.num_edges)
+    for _, _, flow in augmenting_paths(graph, source, sink):
+        pass
+    return flow
+
+
+class UnionFind:
+    def __init__(self, size):
+        self.parent = list(range(size))
+        self.rank = [0] * size
+
+    def find(self, x):
+        root = x
+        while self.parent[root] != root:
+            root = self.parent[root]
+        # Path compression
+        while self.parent[x] != root:
+            self.parent[x], x = root, self.parent[x]
+        return root
+
+    def union(self, a, b):
+        a, b = self.find(a), self.find(b)
+        if a == b:
+            return False
+        if self.rank[a] < self.rank[b]:
+            a, b = b, a
+        self.parent[b] = a
+        if self.rank[a] == self.rank[b]:
+            self.rank[a] += 1
+        return True
+
+
+def union_steps(graph):
+    # Yields (edge_id, merged) as each edge is offered to the union-find
+    components = UnionFind(graph.num_vertices)
+    for edge_id, (u, v) in enumerate(graph.edges.tolist()):
+        yield edge_id, components.union(u, v)
+
+
+def find_bridges(graph):
+    # Iterative Tarjan low-link, linear in vertices + edges; edges are
+    # treated as undirected and parallel edges are never bridges
+    n = graph.num_vertices
+    adjacency = [[] for _ in range(n)]
+    for edge_id, (u, v) in enumerate(graph.edges.tolist()):
+        adjacency[u].append((v, edge_id))
+        adjacency[v].append((u, edge_id))
+
+    order = [-1] * n
+    low = [0] * n
+    bridges = []
+    counter = 0
+    for root in range(n):
+        if order[root] >= 0:
+            continue
+        order[root] = low[root] = counter
+        counter += 1
+        stack = [(root, -1, iter(adjacency[root]))]
+        while stack:
+            u, parent_edge, neighbours = stack[-1]
+            for v, edge_id in neighbours:
+                if edge_id == parent_edge:
+                    continue
+                if order[v] < 0:
+                    order[v] = low[v] = counter
+                    counter += 1
+                    stack.append((v, edge_id, iter(adjacency[v])))
+                    break
+                low[u] = min(low[u], order[v])
+            else:
+                stack.pop()
+                if stack:
+                    parent = stack[-1][0]
+                    low[parent] = min(low[parent], low[u])
+                    if low[u] > order[parent]:
+                        bridges.append(parent_edge)
+    return bridges
+
+
+def flow_text(flow, capacity):
+    return f"{flow:g}/{capacity:g}"
+
+
+class FlowLabels:
+    # "flow/capacity" labels that are updated in place: an update transforms
+    # the existing label into a cached layout of the new string, so only the
+    # labels on the augmenting path change and no Text is laid out twice.
+    def __init__(self, graph, anchors, font_size=24, buff=0.1):
+        self.capacities = graph.capacities.tolist()
+        self.anchors = np.asarray(anchors, dtype=float).reshape(-1, 3)
+        self.font_size = font_size
+        self.buff = buff
+        self.flows = [0] * graph.num_edges
+        self.labels = graph.build_labels(
+            [flow_text(0, capacity) for capacity in self.capacities],
+            self.anchors,
+            font_size=font_size,
+            buff=buff,
+        )
+
+    def _layout(self, edge_id):
+        text = CachedText(
+            flow_text(self.flows[edge_id], self.capacities[edge_id]),
+            font_size=self.font_size,
+        )
+        target = self.anchors[edge_id] + UP * (self.buff + text.height / 2)
+        return text.shift(target - text.get_center())
+
+    def update(self, edge_ids, flow):
+        animations = []
+        for edge_id in edge_ids:
+            self.flows[edge_id] = flow[edge_id]
+            animations.append(
+                Transform(self.labels[edge_id], self._layout(edge_id))
+            )
+        return animations
@@ -0,0 +1,54 @@
+import re
+
+import numpy as np
+from manim import Scene
+
+from text_cache import CachedText
+
+# Scenes whose content comes from a ``params`` dict instead of being written
+# into construct(). The class attribute holds the lecture's own values; a
+# variant is a subclass with some of them replaced, e.g. another graph or
+# the strings in another language:
+#
+#   Spanish = GraphTypes.variant("es", title="Tipos de grafos")
+#
+# Values may be plain JSON (points as [x, y] lists, colors as hex strings),
+# so variants can be described in a batch manifest; see batch_render.py.
+
+
+def as_point(value):
+    # [x, y] or [x, y, z] as a manim point
+    point = np.zeros(3)
+    value = np.asarray(value, dtype=float)
+    point[:len(value)] = value
+    return point
+
+
+def as_points(named_points):
+    return {name: as_point(point) for name, point in named_points.items()}
+
+
+def variant_name(name):
+    return re.sub(r"\W", "_", str(name))
+
+
+class ParametricScene(Scene):
+    params = {"font": None}
+
+    @classmethod
+    def variant(cls, name, **params):
+        unknown = set(params) - set(cls.params)
+        if unknown:
+            raise ValueError(f"{cls.__name__} has no parameters {sorted(unknown)}")
+        return type(f"{cls.__name__}_{variant_name(name)}", (cls,), {
+            "params": {**cls.params, **params},
+            "__module__": cls.__module__,
+        })
+
+    def text_style(self):
+        # Keyword arguments for every text the variant lays out
+        return {"font": self.params["font"]} if self.params.get("font") else {}
+
+    def text(self, string, **kwargs):
+        # CachedText in the variant's font, if it sets one
+        return CachedText(string, **{**self.text_style(), **kwargs})
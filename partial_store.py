@@ -0,0 +1,136 @@
+import os
+import shutil
+from pathlib import Path
+
+from manim import config, logger
+from manim.camera.camera import Camera
+from manim.scene.scene_file_writer import SceneFileWriter
+
+# One content-addressed store of partial movie files shared by every scene.
+# Manim names a partial file after the hash of its play() call (camera,
+# animations and mobjects, not the scene class), so the same animation in
+# IntroScene and CompletePresentation gets the same name in two different
+# scene directories. With this mixin a hash found in the store is
+# hard-linked into the scene's directory and skipped instead of rendered,
+# and every newly written partial is linked into the store. Files are
+# shared, not copied, wherever the filesystem allows it.
+#
+#   renderer = CairoRenderer(file_writer_class=SharedPartialFileWriter)
+#   renderer = CairoRenderer(file_writer_class=shared_partials(FramePipeFileWriter))
+
+MODULE_DIR = Path(__file__).resolve().parent
+DEFAULT_STORE_DIR = MODULE_DIR / "media" / "partial_store"
+
+
+def partial_variant(camera_class=Camera, writer_class=SceneFileWriter):
+    # Manim's hash covers the camera's instance attributes but neither its
+    # class nor the encoder settings, so partials drawn by another camera
+    # class or encoded differently are kept apart; "" for manim's own
+    parts = [] if camera_class is Camera else [camera_class.__name__]
+    encoding = getattr(writer_class, "encoding_variant", None)
+    if encoding is not None and encoding():
+        parts.append(encoding())
+    return "_".join(parts)
+
+
+def partial_settings(camera_class=Camera, writer_class=SceneFileWriter):
+    # Config overrides giving the scene's partial movie files their own
+    # directory for this variant
+    variant = partial_variant(camera_class, writer_class)
+    if not variant:
+        return {}
+    return {"partial_movie_dir": f"{config.partial_movie_dir}_{variant}"}
+
+
+def store_directory(root=DEFAULT_STORE_DIR, variant=""):
+    # One directory per quality and variant. Size and frame rate are camera
+    # attributes and already in manim's hash; the variant is not
+    return Path(root) / (
+        f"{config.pixel_width}x{config.pixel_height}@{config.frame_rate:g}"
+        f"{'_' + variant if variant else ''}{config.movie_file_extension}"
+    )
+
+
+def link_file(source, target):
+    # Atomic hard link, or a copy across filesystems
+    target = Path(target)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    staging = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+    try:
+        os.link(source, staging)
+    except OSError:
+        shutil.copy2(source, staging)
+    os.replace(staging, target)
+    return target
+
+
+class SharedPartialsMixin:
+    store_root = DEFAULT_STORE_DIR
+
+    def _stored(self, hash_invocation):
+        variant = partial_variant(type(self.renderer.camera), type(self))
+        return store_directory(self.store_root, variant) / (
+            f"{hash_invocation}{config.movie_file_extension}"
+        )
+
+    def is_already_cached(self, hash_invocation):
+        if super().is_already_cached(hash_invocation):
+            return True
+        if not hasattr(self, "partial_movie_directory"):
+            return False
+        stored = self._stored(hash_invocation)
+        if not stored.exists():
+            return False
+        os.utime(stored)
+        link_file(stored, self.partial_movie_directory / stored.name)
+        logger.info(f"Linked shared partial movie {stored.name}")
+        return True
+
+    def close_partial_movie_stream(self):
+        super().close_partial_movie_stream()
+        path = Path(self.partial_movie_file_path)
+        if not path.stem.startswith("uncached_") and path.exists():
+            stored = self._stored(path.stem)
+            if not stored.exists():
+                link_file(path, stored)
+
+
+_shared_classes = {}
+
+
+def shared_partials(writer_class):
+    # ``writer_class`` with the shared store mixed in, one class per base
+    if writer_class not in _shared_classes:
+        _shared_classes[writer_class] = type(
+            f"Shared{writer_class.__name__}",
+            (SharedPartialsMixin, writer_class),
+            {},
+        )
+    return _shared_classes[writer_class]
+
+
+SharedPartialFileWriter = shared_partials(SceneFileWriter)
+
+
+def store_usage(root=DEFAULT_STORE_DIR):
+    # (files, bytes, files no scene directory links to any more)
+    files = [path for path in Path(root).rglob("*") if path.is_file()]
+    orphans = [path for path in files if path.stat().st_nlink == 1]
+    return len(files), sum(path.stat().st_size for path in files), len(orphans)
+
+
+def prune_store(max_bytes, root=DEFAULT_STORE_DIR):
+    # Drop least recently used partials until the store fits, starting with
+    # those that no scene directory links to
+    files = [path for path in Path(root).rglob("*") if path.is_file()]
+    stats = {path: path.stat() for path in files}
+    total = sum(stat.st_size for stat in stats.values())
+    files.sort(key=lambda path: (stats[path].st_nlink > 1, stats[path].st_mtime))
+    removed = 0
+    for path in files:
+        if total <= max_bytes:
+            break
+        total -= stats[path].st_size
+        path.unlink(missing_ok=True)
+        removed += 1
+    return removed
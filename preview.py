@@ -0,0 +1,183 @@
+import argparse
+import ast
+import graphlib
+import importlib
+import inspect
+import sys
+import threading
+import time
+import traceback
+from pathlib import Path
+
+from manim import Scene
+from manim.constants import QUALITIES
+from manim.utils.file_ops import open_file
+from watchdog.events import FileSystemEventHandler
+from watchdog.observers import Observer
+
+import graph_theory_presentation as deck
+import render_farm
+import section_cache
+from render_farm import MODULE_DIR, quality_settings
+
+# Live preview daemon. One long-lived process keeps manim, Pango, fonts and
+# the text cache warm and watches the lecture sources. On every save the
+# changed local modules are reloaded in place and each scene's section key
+# (its source plus every module-level value it reads) is recomputed; only
+# scenes whose key changed are re-rendered, at preview quality:
+#
+#   python preview.py --open
+#   python preview.py GraphTypes ShortestPathAlgorithms -q medium_quality
+
+DEBOUNCE = 0.15
+# Module state that must survive a reload
+KEEP_LOADED = {"text_cache", "preview", "__main__"}
+
+
+class _SourceChanges(FileSystemEventHandler):
+    def __init__(self):
+        self.changed = threading.Event()
+
+    # Only writes count: reading a source (reload() and getsource() do)
+    # also fires opened/closed events
+    def _check(self, *paths):
+        for path in paths:
+            if path and Path(path).suffix == ".py" and \
+                    Path(path).resolve().parent == MODULE_DIR:
+                self.changed.set()
+
+    def on_modified(self, event):
+        self._check(event.src_path)
+
+    def on_created(self, event):
+        self._check(event.src_path)
+
+    def on_moved(self, event):
+        self._check(event.src_path, event.dest_path)
+
+
+def _imported_names(path):
+    names = set()
+    for node in ast.walk(ast.parse(Path(path).read_bytes())):
+        if isinstance(node, ast.Import):
+            names.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names.add(node.module)
+    return names
+
+
+def local_modules():
+    # Loaded lecture modules, each after the local modules it imports, so a
+    # reload never leaves a user holding classes from a stale dependency
+    modules = {
+        name: module for name, module in sys.modules.items()
+        if name not in KEEP_LOADED and getattr(module, "__file__", None)
+        and Path(module.__file__).resolve().parent == MODULE_DIR
+    }
+    order = graphlib.TopologicalSorter({
+        name: _imported_names(module.__file__) & modules.keys()
+        for name, module in modules.items()
+    })
+    return [modules[name] for name in order.static_order()]
+
+
+def reload_sources():
+    for module in local_modules():
+        importlib.reload(module)
+
+
+def scene_keys(settings, names=None):
+    keys = {}
+    for name in names or preview_scenes():
+        scene_cls = getattr(deck, name, None)
+        if scene_cls is not None:
+            keys[name] = section_cache.section_key(scene_cls, settings)
+    return keys
+
+
+def preview_scenes():
+    # The full deck re-renders whenever any section changes; ask for it by
+    # name to preview it
+    return [
+        name for name, value in vars(deck).items()
+        if inspect.isclass(value) and issubclass(value, Scene)
+        and value.__module__ == deck.__name__ and name != "CompletePresentation"
+    ]
+
+
+def render(names, quality, lod=False, open_movie=False):
+    for name in names:
+        start = time.perf_counter()
+        try:
+            movie = render_farm.render_section(name, quality, lod=lod)
+        except Exception:
+            traceback.print_exc()
+            continue
+        print(f"{name}: {time.perf_counter() - start:.2f}s -> {movie}", flush=True)
+        if open_movie:
+            open_file(Path(movie))
+
+
+def watch(names=None, quality="low_quality", lod=False, open_movie=False):
+    settings = quality_settings(quality)
+    keys = scene_keys(settings, names)
+    handler = _SourceChanges()
+    observer = Observer()
+    observer.schedule(handler, str(MODULE_DIR), recursive=False)
+    observer.start()
+    print(f"watching {MODULE_DIR} ({', '.join(keys)})", flush=True)
+    try:
+        while True:
+            handler.changed.wait()
+            # Editors often write a file in several steps
+            time.sleep(DEBOUNCE)
+            handler.changed.clear()
+            try:
+                reload_sources()
+                current = scene_keys(settings, names)
+            except Exception:
+                traceback.print_exc()
+                continue
+            changed = [
+                name for name, key in current.items() if keys.get(name) != key
+            ]
+            keys = current
+            if changed:
+                render(changed, quality, lod, open_movie)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        observer.stop()
+        observer.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Re-render changed scenes whenever the sources are saved"
+    )
+    parser.add_argument(
+        "scenes", nargs="*",
+        help="scenes to watch (defaults to every section scene)"
+    )
+    parser.add_argument(
+        "-q", "--quality", default="low_quality", choices=sorted(QUALITIES)
+    )
+    parser.add_argument(
+        "--lod", action="store_true", help="render with the LOD camera"
+    )
+    parser.add_argument(
+        "--open", action="store_true", help="open each new render"
+    )
+    parser.add_argument(
+        "--render-first", action="store_true",
+        help="render the watched scenes once before waiting for changes"
+    )
+    args = parser.parse_args()
+
+    if args.render_first:
+        render(args.scenes or preview_scenes(), args.quality, args.lod, args.open)
+    watch(args.scenes or None, args.quality, args.lod, args.open)
+
+
+if __name__ == "__main__":
+    main()
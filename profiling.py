@@ -0,0 +1,227 @@
+import argparse
+import json
+import linecache
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import manim
+from manim import Arrow, Matrix, Scene, Text, VGroup, tempconfig
+from manim.constants import QUALITIES
+
+import graph_theory_presentation as deck
+from render_farm import MODULE_DIR, render_config
+
+# Opt-in span profiler for scene renders. While installed it wraps
+# Scene.play (wait() is a play of a Wait), the Text, Matrix and Arrow
+# constructors and VGroup.arrange, and records one span per call named after
+# the scene line that made it, e.g.
+#
+#   GraphTypes line 331: self.play(Create(weighted_cities))
+#
+# Spans nest, so time spent laying out a Text inside a Matrix is attributed
+# to both. They export as Chrome trace JSON (chrome://tracing, Perfetto) or
+# as collapsed stacks for flamegraph.pl / speedscope:
+#
+#   python profiling.py CompletePresentation -o media/profiles
+#
+#   with Profiler() as profiler:
+#       IntroScene().render()
+#   profiler.write_chrome_trace("intro.json")
+
+MANIM_DIR = str(Path(manim.__file__).resolve().parent)
+THIS_FILE = str(Path(__file__).resolve())
+
+
+def _caller():
+    # Innermost frame outside manim and this module that runs on a Scene,
+    # i.e. the construct() line responsible for the call
+    frame = sys._getframe(2)
+    fallback = None
+    while frame is not None:
+        filename = os.path.abspath(frame.f_code.co_filename)
+        if not filename.startswith(MANIM_DIR) and filename != THIS_FILE:
+            if fallback is None:
+                fallback = frame
+            if isinstance(frame.f_locals.get("self"), Scene):
+                return frame
+        frame = frame.f_back
+    return fallback
+
+
+def _describe(frame):
+    if frame is None:
+        return "?", "", 0
+    code = frame.f_code
+    owner = code.co_qualname.split(".")[0]
+    return owner, code.co_filename, frame.f_lineno
+
+
+class Span:
+    __slots__ = ("kind", "name", "scene", "filename", "line", "start", "end",
+                 "parent", "thread")
+
+    def __init__(self, kind, name, scene, filename, line, parent, thread):
+        self.kind = kind
+        self.name = name
+        self.scene = scene
+        self.filename = filename
+        self.line = line
+        self.parent = parent
+        self.thread = thread
+        self.start = time.perf_counter()
+        self.end = None
+
+    def stack(self):
+        names = []
+        span = self
+        while span is not None:
+            names.append(span.name)
+            span = span.parent
+        names.append(self.scene)
+        return names[::-1]
+
+
+class Profiler:
+    targets = (
+        (Scene, "play", "play"),
+        (Text, "__init__", "Text"),
+        (Matrix, "__init__", "Matrix"),
+        (Arrow, "__init__", "Arrow"),
+        (VGroup, "arrange", "VGroup.arrange"),
+    )
+
+    def __init__(self):
+        self.spans = []
+        self._local = threading.local()
+        self._originals = []
+        self._origin = time.perf_counter()
+
+    def _wrap(self, function, kind):
+        profiler = self
+
+        def wrapper(obj, *args, **kwargs):
+            frame = _caller()
+            owner, filename, line = _describe(frame)
+            if kind == "play":
+                scene = type(obj).__name__
+                source = linecache.getline(filename, line).strip()
+                name = f"{owner} line {line}: {source}"
+            else:
+                runner = frame.f_locals.get("self") if frame else None
+                scene = (
+                    type(runner).__name__ if isinstance(runner, Scene) else owner
+                )
+                name = f"{kind} ({owner} line {line})"
+            parent = getattr(profiler._local, "current", None)
+            span = Span(
+                kind, name, scene, filename, line, parent, threading.get_ident()
+            )
+            profiler._local.current = span
+            try:
+                return function(obj, *args, **kwargs)
+            finally:
+                span.end = time.perf_counter()
+                profiler._local.current = parent
+                profiler.spans.append(span)
+
+        wrapper.__wrapped__ = function
+        return wrapper
+
+    def install(self):
+        for cls, attribute, kind in self.targets:
+            self._originals.append((cls, attribute, cls.__dict__.get(attribute)))
+            setattr(cls, attribute, self._wrap(getattr(cls, attribute), kind))
+        return self
+
+    def uninstall(self):
+        for cls, attribute, original in reversed(self._originals):
+            if original is None:
+                delattr(cls, attribute)
+            else:
+                setattr(cls, attribute, original)
+        self._originals.clear()
+
+    def __enter__(self):
+        return self.install()
+
+    def __exit__(self, *exc_info):
+        self.uninstall()
+
+    def chrome_trace(self):
+        events = []
+        for span in self.spans:
+            events.append({
+                "name": span.name,
+                "cat": span.scene,
+                "ph": "X",
+                "ts": (span.start - self._origin) * 1e6,
+                "dur": (span.end - span.start) * 1e6,
+                "pid": os.getpid(),
+                "tid": span.thread,
+                "args": {"file": span.filename, "line": span.line},
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def collapsed_stacks(self):
+        # Self time in microseconds per stack, children subtracted
+        child_time = defaultdict(float)
+        for span in self.spans:
+            if span.parent is not None:
+                child_time[id(span.parent)] += span.end - span.start
+        totals = defaultdict(float)
+        for span in self.spans:
+            self_time = span.end - span.start - child_time[id(span)]
+            totals[";".join(span.stack())] += max(self_time, 0.0)
+        return [
+            f"{stack} {round(seconds * 1e6)}"
+            for stack, seconds in sorted(totals.items())
+        ]
+
+    def write_chrome_trace(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("w", encoding="utf-8") as fp:
+            json.dump(self.chrome_trace(), fp)
+        return path
+
+    def write_collapsed(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("w", encoding="utf-8") as fp:
+            fp.write("\n".join(self.collapsed_stacks()) + "\n")
+        return path
+
+    def top(self, count=10):
+        # Slowest play() calls, the first place to look
+        plays = [span for span in self.spans if span.kind == "play"]
+        plays.sort(key=lambda span: span.end - span.start, reverse=True)
+        return [(span.name, span.end - span.start) for span in plays[:count]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile one scene render")
+    parser.add_argument("scene", nargs="?", default="CompletePresentation")
+    parser.add_argument(
+        "-q", "--quality", default="low_quality", choices=sorted(QUALITIES)
+    )
+    parser.add_argument(
+        "-o", "--output", default=str(MODULE_DIR / "media" / "profiles")
+    )
+    args = parser.parse_args()
+
+    output = Path(args.output)
+    with tempconfig(render_config(args.quality)):
+        with Profiler() as profiler:
+            getattr(deck, args.scene)().render()
+    print(profiler.write_chrome_trace(output / f"{args.scene}.trace.json"))
+    print(profiler.write_collapsed(output / f"{args.scene}.folded"))
+    for name, seconds in profiler.top():
+        print(f"{seconds:8.2f}s  {name}")
+
+
+if __name__ == "__main__":
+    main()
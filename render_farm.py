@@ -0,0 +1,201 @@
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import av
+from manim import config, logger, tempconfig
+from manim.camera.camera import Camera
+from manim.constants import QUALITIES
+from manim.renderer.cairo_renderer import CairoRenderer
+from manim.scene.scene_file_writer import SceneFileWriter
+
+import graph_theory_presentation as deck
+from frame_pipe import FramePipeFileWriter
+from lod_camera import LODCamera
+from partial_store import (
+    partial_settings, partial_variant, prune_store, shared_partials,
+    store_usage,
+)
+from section_cache import SectionCache, section_key
+from text_cache import prune_text_cache, text_cache_stats
+
+# Render every section of CompletePresentation as its own scene, one scene per
+# core, then stitch the section movies together without re-encoding. Sections
+# whose source, constants and settings are unchanged come from the cache:
+#
+#   python render_farm.py -q low_quality -j 32
+
+MODULE_DIR = Path(deck.__file__).resolve().parent
+
+
+def quality_settings(quality):
+    # tempconfig ignores the "quality" shortcut, so spell out what it sets
+    return {
+        key: QUALITIES[quality][key]
+        for key in ("pixel_width", "pixel_height", "frame_rate")
+    }
+
+
+def render_config(quality):
+    settings = quality_settings(quality)
+    settings.update({
+        "input_file": str(MODULE_DIR / "graph_theory_presentation.py"),
+        "media_dir": str(MODULE_DIR / "media"),
+    })
+    return settings
+
+
+def pipeline_classes(frame_pipe=False, lod=False):
+    # (camera class, file writer class) for a render
+    return (
+        LODCamera if lod else Camera,
+        FramePipeFileWriter if frame_pipe else SceneFileWriter,
+    )
+
+
+def render_section(scene_name, quality, frame_pipe=False, lod=False,
+                   shared=True):
+    # ``scene_name`` may also be a scene class, e.g. a parametric variant
+    camera_class, writer_class = pipeline_classes(frame_pipe, lod)
+    settings = render_config(quality)
+    settings.update(partial_settings(camera_class, writer_class))
+    with tempconfig(settings):
+        scene_cls = getattr(deck, scene_name) if isinstance(scene_name, str) \
+            else scene_name
+        scene_name = scene_cls.__name__
+        renderer_kwargs = {
+            "file_writer_class":
+                shared_partials(writer_class) if shared else writer_class,
+            "camera_class": camera_class,
+        }
+        scene = scene_cls(renderer=CairoRenderer(**renderer_kwargs))
+        scene.render()
+        logger.info(f"{scene_name} text cache: {text_cache_stats()}")
+        return str(scene.renderer.file_writer.movie_file_path)
+
+
+def concat_movies(movie_files, output_file):
+    # Same concat-demuxer stream copy manim uses to join partial movie files
+    output_file = Path(output_file)
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    file_list = output_file.with_name(f"{output_file.stem}_sections.txt")
+    with file_list.open("w", encoding="utf-8") as fp:
+        for movie_file in movie_files:
+            fp.write(f"file 'file:{Path(movie_file).as_posix()}'\n")
+
+    movies_input = av.open(
+        str(file_list), options={"safe": "0", "an": "1"}, format="concat"
+    )
+    input_stream = movies_input.streams.video[0]
+    output_container = av.open(str(output_file), mode="w")
+    output_stream = output_container.add_stream(template=input_stream)
+    for packet in movies_input.demux(input_stream):
+        # Skip the flushing packets and let libav recompute dts across files
+        if packet.dts is None:
+            continue
+        packet.dts = None
+        packet.stream = output_stream
+        output_container.mux(packet)
+
+    movies_input.close()
+    output_container.close()
+    file_list.unlink()
+    return output_file
+
+
+def output_path(quality, scene_name="CompletePresentation"):
+    with tempconfig(render_config(quality)):
+        video_dir = config.get_dir(
+            "video_dir", module_name="graph_theory_presentation"
+        )
+        return video_dir / f"{scene_name}{config.movie_file_extension}"
+
+
+def render_presentation(quality="low_quality", jobs=None, cache=None,
+                        frame_pipe=False, lod=False, shared=True):
+    cache = cache or SectionCache()
+    settings = quality_settings(quality)
+    variant = partial_variant(*pipeline_classes(frame_pipe, lod))
+    if variant:
+        settings["variant"] = variant
+    keys = {
+        scene.__name__: section_key(scene, settings)
+        for scene in deck.PRESENTATION_SECTIONS
+    }
+    movie_files = {
+        name: cache.lookup(key, name) for name, key in keys.items()
+    }
+    stale = [name for name, movie in movie_files.items() if movie is None]
+
+    if stale:
+        jobs = min(jobs or os.cpu_count() or 1, len(stale))
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            rendered = pool.map(
+                render_section, stale,
+                [quality] * len(stale), [frame_pipe] * len(stale),
+                [lod] * len(stale), [shared] * len(stale),
+            )
+            for name, movie_file in zip(stale, rendered):
+                movie_files[name] = cache.store(keys[name], name, movie_file)
+
+    cache.evict(keep=set(keys.values()))
+    cache.save()
+    return concat_movies(movie_files.values(), output_path(quality))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Render CompletePresentation one section per process"
+    )
+    parser.add_argument(
+        "-q", "--quality", default="low_quality", choices=sorted(QUALITIES)
+    )
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=None,
+        help="worker processes (defaults to one per core)"
+    )
+    parser.add_argument(
+        "--cache-size", type=int, default=2048,
+        help="section cache budget in MiB"
+    )
+    parser.add_argument(
+        "--frame-pipe", action="store_true",
+        help="encode in a separate process fed from a shared frame ring"
+    )
+    parser.add_argument(
+        "--lod", action="store_true",
+        help="cull off-screen and sub-pixel mobjects, splat dense edge bundles"
+    )
+    parser.add_argument(
+        "--no-shared-partials", action="store_true",
+        help="keep partial movie files per scene instead of in the shared store"
+    )
+    parser.add_argument(
+        "--store-size", type=int, default=4096,
+        help="shared partial movie store budget in MiB"
+    )
+    parser.add_argument(
+        "--text-cache-size", type=int, default=256,
+        help="laid-out text cache budget in MiB"
+    )
+    args = parser.parse_args()
+
+    cache = SectionCache(max_bytes=args.cache_size * 1024**2)
+    print(render_presentation(
+        args.quality, args.jobs, cache,
+        frame_pipe=args.frame_pipe, lod=args.lod,
+        shared=not args.no_shared_partials,
+    ))
+    print(f"section cache: {cache.manifest['last_run']}")
+    removed = prune_text_cache(args.text_cache_size * 1024**2, MODULE_DIR / "media")
+    print(f"text cache: {removed} files pruned")
+    if not args.no_shared_partials:
+        removed = prune_store(args.store_size * 1024**2)
+        files, size, orphans = store_usage()
+        print(f"partial store: {removed} files pruned, {files} left "
+              f"({size / 1024**2:.0f} MiB, {orphans} unlinked)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+import hashlib
+import inspect
+import json
+import shutil
+import sys
+import time
+import types
+from pathlib import Path
+
+import manim
+
+# Content-addressed cache of rendered sections. A section's key covers its
+# class source, every module-level value its construct() reads (colors,
+# directions, helper classes...) and the render settings, so an edit to one
+# scene only invalidates that scene.
+
+MODULE_DIR = Path(__file__).resolve().parent
+DEFAULT_CACHE_DIR = MODULE_DIR / "media" / "section_cache"
+DEFAULT_MAX_BYTES = 2 * 1024**3
+
+
+def _code_names(code):
+    # Global names read by a function, including its comprehensions/lambdas
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names |= _code_names(const)
+    return names
+
+
+def _is_local(obj):
+    module = sys.modules.get(getattr(obj, "__module__", None) or "")
+    path = getattr(module, "__file__", None)
+    return path is not None and Path(path).resolve().parent == MODULE_DIR
+
+
+def _fingerprint(value, seen):
+    if isinstance(value, (list, tuple)):
+        return "[" + ",".join(_fingerprint(item, seen) for item in value) + "]"
+    if isinstance(value, dict):
+        return "{" + ",".join(
+            f"{key!r}:{_fingerprint(item, seen)}"
+            for key, item in sorted(value.items(), key=lambda kv: repr(kv[0]))
+        ) + "}"
+    if isinstance(value, (type, types.FunctionType)):
+        if not _is_local(value):
+            # Library objects only change with the library version
+            return f"{value.__module__}.{value.__qualname__}@{manim.__version__}"
+        if value in seen:
+            return value.__qualname__
+        seen.add(value)
+        if value.__module__ in ("graph_theory_presentation", "__main__"):
+            return _source_fingerprint(value, seen)
+        # Helpers from the other lecture modules: their whole file counts
+        return inspect.getsource(sys.modules[value.__module__])
+    if isinstance(value, types.ModuleType):
+        return value.__name__
+    return repr(value)
+
+
+def _source_fingerprint(obj, seen):
+    source = inspect.getsource(obj)
+    module_globals = vars(sys.modules[obj.__module__])
+
+    functions = [obj] if isinstance(obj, types.FunctionType) else [
+        member for member in vars(obj).values()
+        if isinstance(member, types.FunctionType)
+    ]
+    names = set()
+    for function in functions:
+        names |= _code_names(function.__code__)
+
+    parts = [source]
+    for name in sorted(names):
+        if name in module_globals:
+            parts.append(f"{name}={_fingerprint(module_globals[name], seen)}")
+    return "\n".join(parts)
+
+
+def section_key(scene_cls, settings):
+    digest = hashlib.sha256()
+    digest.update(_source_fingerprint(scene_cls, set()).encode())
+    digest.update(json.dumps(settings, sort_keys=True, default=str).encode())
+    digest.update(manim.__version__.encode())
+    return digest.hexdigest()[:32]
+
+
+class SectionCache:
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.manifest_path = self.cache_dir / "manifest.json"
+        self.max_bytes = max_bytes
+        if self.manifest_path.exists():
+            self.manifest = json.loads(self.manifest_path.read_text())
+        else:
+            self.manifest = {"hits": 0, "misses": 0, "entries": {}}
+        self.manifest["last_run"] = {}
+
+    def movie_path(self, key):
+        return self.cache_dir / f"{key}.mp4"
+
+    def lookup(self, key, scene_name):
+        entry = self.manifest["entries"].get(key)
+        if entry is None or not self.movie_path(key).exists():
+            self.manifest["entries"].pop(key, None)
+            self.manifest["misses"] += 1
+            self.manifest["last_run"][scene_name] = "miss"
+            return None
+        entry["hits"] += 1
+        entry["last_used"] = time.time()
+        self.manifest["hits"] += 1
+        self.manifest["last_run"][scene_name] = "hit"
+        return self.movie_path(key)
+
+    def store(self, key, scene_name, movie_file):
+        cached = self.movie_path(key)
+        shutil.copyfile(movie_file, cached)
+        self.manifest["entries"][key] = {
+            "scene": scene_name,
+            "size": cached.stat().st_size,
+            "hits": 0,
+            "last_used": time.time(),
+        }
+        return cached
+
+    def evict(self, keep=()):
+        # Drop least recently used sections until the cache fits its budget
+        entries = self.manifest["entries"]
+        total = sum(entry["size"] for entry in entries.values())
+        for key in sorted(entries, key=lambda k: entries[k]["last_used"]):
+            if total <= self.max_bytes:
+                break
+            if key in keep:
+                continue
+            total -= entries.pop(key)["size"]
+            self.movie_path(key).unlink(missing_ok=True)
+
+    def save(self):
+        self.manifest_path.write_text(json.dumps(self.manifest, indent=4))
@@ -0,0 +1,103 @@
+import hashlib
+import os
+import pickle
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+import manim
+from manim import Text, config
+
+# Process-wide memo for Text mobjects. Laying out a string through Pango and
+# parsing the resulting SVG is the most expensive part of building our
+# scenes, and the same labels and bullet sizes come up over and over. Each
+# distinct (string, font, size, color, ...) is laid out once; callers get a
+# copy they are free to move and recolor. Laid-out text is also pickled next
+# to manim's own media/texts SVG cache so later runs skip the layout too;
+# prune_text_cache() keeps that directory within a size budget.
+
+MAX_ENTRIES = 1024
+TEXT_CACHE_DIR = "text_mobjects"
+
+_templates = OrderedDict()
+_stats = {
+    "hits": 0, "disk_hits": 0, "misses": 0,
+    "seconds_saved": 0.0, "layout_seconds": 0.0,
+}
+
+
+def _cache_key(text, kwargs):
+    return (text, tuple(sorted((key, repr(value)) for key, value in kwargs.items())))
+
+
+def text_cache_dir(media_dir=None):
+    return Path(media_dir or config.media_dir) / TEXT_CACHE_DIR
+
+
+def _disk_path(key):
+    digest = hashlib.sha256(repr((manim.__version__, key)).encode()).hexdigest()
+    return text_cache_dir() / f"{digest[:24]}.pkl"
+
+
+def _load_or_build(key, text, kwargs):
+    path = _disk_path(key)
+    if path.exists():
+        try:
+            with path.open("rb") as fp:
+                mob, build_time = pickle.load(fp)
+            # Last use, for prune_text_cache
+            os.utime(path)
+            _stats["disk_hits"] += 1
+            _stats["seconds_saved"] += build_time
+            return mob, build_time
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            path.unlink(missing_ok=True)
+
+    start = time.perf_counter()
+    mob = Text(text, **kwargs)
+    build_time = time.perf_counter() - start
+    _stats["misses"] += 1
+    _stats["layout_seconds"] += build_time
+
+    # Render workers share this directory: write aside, then swap it in
+    path.parent.mkdir(parents=True, exist_ok=True)
+    staging = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with staging.open("wb") as fp:
+        pickle.dump((mob, build_time), fp, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(staging, path)
+    return mob, build_time
+
+
+def CachedText(text, **kwargs):
+    key = _cache_key(text, kwargs)
+    if key in _templates:
+        _templates.move_to_end(key)
+        mob, build_time = _templates[key]
+        _stats["hits"] += 1
+        _stats["seconds_saved"] += build_time
+    else:
+        mob, build_time = _load_or_build(key, text, kwargs)
+        _templates[key] = (mob, build_time)
+        if len(_templates) > MAX_ENTRIES:
+            _templates.popitem(last=False)
+    return mob.copy()
+
+
+def text_cache_stats():
+    return dict(_stats, entries=len(_templates))
+
+
+def prune_text_cache(max_bytes, media_dir=None):
+    # Drop the least recently used pickles until the directory fits
+    files = list(text_cache_dir(media_dir).glob("*.pkl"))
+    stats = {path: path.stat() for path in files}
+    total = sum(stat.st_size for stat in stats.values())
+    files.sort(key=lambda path: stats[path].st_mtime)
+    removed = 0
+    for path in files:
+        if total <= max_bytes:
+            break
+        total -= stats[path].st_size
+        path.unlink(missing_ok=True)
+        removed += 1
+    return removed
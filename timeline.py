@@ -0,0 +1,237 @@
+import argparse
+import bisect
+import json
+import pickle
+from pathlib import Path
+
+from manim import config, logger, tempconfig
+from manim.constants import QUALITIES
+
+import graph_theory_presentation as deck
+from render_farm import MODULE_DIR, quality_settings, render_config
+
+# Timeline index for seeking into long renders. A scene rendered through
+# timeline_scene() records where every play() starts and ends, and at every
+# section boundary a snapshot of what is on screen (empty for the deck,
+# which releases each section before the next). Seeking to a timestamp then
+# restarts at the nearest section with a snapshot and lets manim skip the
+# plays before the one holding that timestamp, so nothing earlier is
+# rasterized and earlier sections are not even constructed:
+#
+#   python timeline.py record CompletePresentation -q low_quality
+#   python timeline.py seek CompletePresentation 7:00 --duration 30
+
+DEFAULT_TIMELINE_DIR = MODULE_DIR / "media" / "timelines"
+
+
+def timeline_path(scene_name, settings, root=DEFAULT_TIMELINE_DIR):
+    # Timing depends on the frame rate, so each quality has its own index
+    return Path(root) / (
+        f"{scene_name}_{settings['pixel_height']}p{settings['frame_rate']:g}.json"
+    )
+
+
+def _config_settings():
+    return {
+        "pixel_width": config.pixel_width,
+        "pixel_height": config.pixel_height,
+        "frame_rate": config.frame_rate,
+    }
+
+
+class TimelineMixin:
+    timeline_root = DEFAULT_TIMELINE_DIR
+    record_timeline = True
+    restored_mobjects = ()
+
+    def setup(self):
+        super().setup()
+        self.timeline_sections = []
+        self.timeline_plays = []
+        self.snapshots = {}
+        self.add(*self.restored_mobjects)
+        self._record_section("start")
+
+    def _record_section(self, name):
+        index = len(self.timeline_sections)
+        try:
+            snapshot = pickle.dumps(list(self.mobjects)) if self.mobjects else None
+            restorable = True
+        except (pickle.PicklingError, TypeError, AttributeError):
+            snapshot, restorable = None, False
+        if snapshot is not None:
+            self.snapshots[index] = snapshot
+        self.timeline_sections.append({
+            "name": name,
+            "start": self.renderer.time,
+            "first_play": len(self.timeline_plays),
+            "restorable": restorable,
+            "snapshot": snapshot is not None,
+        })
+
+    def next_section(self, name="unnamed", *args, **kwargs):
+        self._record_section(name)
+        super().next_section(name, *args, **kwargs)
+
+    def play(self, *args, **kwargs):
+        start = self.renderer.time
+        super().play(*args, **kwargs)
+        self.timeline_plays.append((start, self.renderer.time))
+
+    def render(self, preview=False):
+        rerun = super().render(preview)
+        if not rerun and self.record_timeline:
+            self.save_timeline()
+        return rerun
+
+    def save_timeline(self):
+        settings = _config_settings()
+        path = timeline_path(self.__class__.__name__, settings, self.timeline_root)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        for index, snapshot in self.snapshots.items():
+            path.with_suffix(f".{index}.pkl").write_bytes(snapshot)
+        with path.open("w", encoding="utf-8") as fp:
+            json.dump({
+                "scene": self.__class__.__name__,
+                "settings": settings,
+                "duration": self.renderer.time,
+                "sections": self.timeline_sections,
+                "plays": self.timeline_plays,
+            }, fp)
+        return path
+
+
+_timeline_classes = {}
+
+
+def timeline_scene(scene_cls):
+    # ``scene_cls`` recording its timeline; same name, so same output files
+    if scene_cls not in _timeline_classes:
+        _timeline_classes[scene_cls] = type(
+            scene_cls.__name__, (TimelineMixin, scene_cls),
+            {"__module__": scene_cls.__module__},
+        )
+    return _timeline_classes[scene_cls]
+
+
+class Timeline:
+    def __init__(self, path):
+        self.path = Path(path)
+        with self.path.open(encoding="utf-8") as fp:
+            self.data = json.load(fp)
+        self.sections = self.data["sections"]
+        self.plays = self.data["plays"]
+        self.starts = [start for start, _ in self.plays]
+
+    @property
+    def duration(self):
+        return self.data["duration"]
+
+    def snapshot(self, section_index):
+        if not self.sections[section_index]["snapshot"]:
+            return []
+        return pickle.loads(
+            self.path.with_suffix(f".{section_index}.pkl").read_bytes()
+        )
+
+    def play_at(self, timestamp):
+        return max(bisect.bisect_right(self.starts, timestamp) - 1, 0)
+
+    def locate(self, timestamp, can_restart=True):
+        # (section index to restart at, first play to render, offset of the
+        # timestamp from that play's start)
+        play = self.play_at(timestamp)
+        section = 0
+        if can_restart:
+            for index, info in enumerate(self.sections):
+                if info["first_play"] > play:
+                    break
+                if info["restorable"]:
+                    section = index
+        offset = timestamp - self.starts[play] if self.plays else 0.0
+        return section, play, offset
+
+
+def load_timeline(scene_name, quality, root=DEFAULT_TIMELINE_DIR):
+    return Timeline(timeline_path(scene_name, quality_settings(quality), root))
+
+
+def record(scene_name, quality):
+    with tempconfig(render_config(quality)):
+        scene = timeline_scene(getattr(deck, scene_name))()
+        scene.render()
+        return str(scene.renderer.file_writer.movie_file_path)
+
+
+def seek_render(scene_name, timestamp, quality, duration=None):
+    # Renders from the play holding ``timestamp``; returns the movie and the
+    # offset of ``timestamp`` into it
+    scene_cls = getattr(deck, scene_name)
+    timeline = load_timeline(scene_name, quality)
+    can_restart = hasattr(scene_cls, "start_section")
+    section, play, offset = timeline.locate(timestamp, can_restart)
+    info = timeline.sections[section]
+    # A seek render's timeline would start part way through; keep the
+    # recorded one
+    attributes = {
+        "restored_mobjects": timeline.snapshot(section),
+        "record_timeline": False,
+        "__module__": scene_cls.__module__,
+    }
+    if section > 0:
+        attributes["start_section"] = info["name"]
+
+    settings = render_config(quality)
+    settings["from_animation_number"] = play - info["first_play"]
+    if duration is not None:
+        last = timeline.play_at(timestamp + duration)
+        settings["upto_animation_number"] = last - info["first_play"]
+    settings["output_file"] = f"{scene_name}_from_{timestamp:g}s"
+    with tempconfig(settings):
+        scene = type(scene_name, (timeline_scene(scene_cls),), attributes)()
+        scene.render()
+        logger.info(
+            f"Restarted at section {info['name']!r}, "
+            f"skipped {settings['from_animation_number']} plays"
+        )
+        return str(scene.renderer.file_writer.movie_file_path), offset
+
+
+def parse_timestamp(value):
+    # Seconds, "m:ss" or "h:mm:ss"
+    seconds = 0.0
+    for part in value.split(":"):
+        seconds = seconds * 60 + float(part)
+    return seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Record a scene's timeline index or render from a timestamp"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    record_parser = commands.add_parser("record", help="render and save the index")
+    record_parser.add_argument("scene")
+    seek_parser = commands.add_parser("seek", help="render from a timestamp")
+    seek_parser.add_argument("scene")
+    seek_parser.add_argument("timestamp", type=parse_timestamp)
+    seek_parser.add_argument(
+        "--duration", type=parse_timestamp, help="stop after this much footage"
+    )
+    for command in (record_parser, seek_parser):
+        command.add_argument(
+            "-q", "--quality", default="low_quality", choices=sorted(QUALITIES)
+        )
+    args = parser.parse_args()
+
+    if args.command == "record":
+        print(record(args.scene, args.quality))
+        return
+    movie, offset = seek_render(
+        args.scene, args.timestamp, args.quality, args.duration
+    )
+    print(f"{movie} (requested time at {offset:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
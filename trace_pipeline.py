@@ -0,0 +1,57 @@
+import math
+from itertools import islice
+
+from manim import config
+from manim.animation.animation import prepare_animation
+
+# Plays an algorithm trace without one self.play() per step. Steps are
+# pulled lazily from a generator; consecutive steps that would land inside
+# the same frame budget are merged into one play() call, and when the
+# number of steps is known batches grow so that a trace of any length takes
+# at most ``max_plays`` play() calls, i.e. partial movie files. A trace of
+# unknown length doubles its batch size after every ``max_plays`` plays, so
+# its play count grows with the logarithm of its length.
+
+MAX_PLAYS = 60
+
+
+def _animations(step):
+    if isinstance(step, (list, tuple)):
+        return [prepare_animation(animation) for animation in step]
+    return [prepare_animation(step)]
+
+
+def coalesce(steps, step_time, frame_rate, frame_budget=1,
+             max_plays=MAX_PLAYS, num_steps=None):
+    # Yields (animations, run_time) covering at least ``frame_budget`` frames
+    steps_per_play = max(1, int(frame_budget / (frame_rate * step_time)))
+    if num_steps is None and hasattr(steps, "__len__"):
+        num_steps = len(steps)
+    if num_steps is not None:
+        steps_per_play = max(steps_per_play, math.ceil(num_steps / max_plays))
+    steps = iter(steps)
+    plays = 0
+    while True:
+        batch = list(islice(steps, steps_per_play))
+        if not batch:
+            return
+        # Within one play a mobject keeps only its latest step
+        merged = {}
+        for step in batch:
+            for animation in _animations(step):
+                merged[id(animation.mobject)] = animation
+        yield list(merged.values()), len(batch) * step_time
+        plays += 1
+        if num_steps is None and plays % max_plays == 0:
+            steps_per_play *= 2
+
+
+def play_trace(scene, steps, step_time=0.5, frame_budget=1,
+               max_plays=MAX_PLAYS, num_steps=None):
+    plays = 0
+    for animations, run_time in coalesce(
+        steps, step_time, config.frame_rate, frame_budget, max_plays, num_steps
+    ):
+        scene.play(*animations, run_time=run_time)
+        plays += 1
+    return plays